@@ -1,11 +1,14 @@
-from PySide6.QtWidgets import QApplication
+from multiprocessing import freeze_support
 import sys
 
-# Importa a janela da estrutura modularizada
-from ui.main_window import MainWindow  # noqa: E402
-
 
 def main() -> int:
+    # Importado aqui para que o modo linha de comando não carregue o Qt
+    from PySide6.QtWidgets import QApplication
+
+    # Importa a janela da estrutura modularizada
+    from ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -13,4 +16,10 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    freeze_support()  # necessário para o pool de processos em executáveis congelados
+    if len(sys.argv) > 1:
+        # Com argumentos: execução em lote, sem interface (ver cli.py)
+        from cli import main as main_cli
+
+        sys.exit(main_cli())
     sys.exit(main())
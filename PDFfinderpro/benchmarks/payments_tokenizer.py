@@ -0,0 +1,56 @@
+"""
+Compara o tokenizador de pagamentos com re.findall(REGEX_PAGAMENTOS).
+
+Uso (na pasta PDFfinderpro):
+    python benchmarks/payments_tokenizer.py [repetições]
+
+"Página normal" imita o texto de um PDF de pagamentos; "página adversária" é
+texto corrido sem valores (OCR ruim), onde a regex volta atrás em cada início.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants.regex import REGEX_PAGAMENTOS  # noqa: E402
+from services.payments_tokenizer import tokenizar_pagamentos  # noqa: E402
+
+
+def pagina_normal(linhas: int = 60) -> str:
+    return "".join(
+        f"SERVIDOR {chr(65 + i % 26)}{chr(65 + i // 26 % 26)} DA SILVA\n{i + 1}.{i % 1000:03d},{i % 100:02d}\n"
+        for i in range(linhas)
+    )
+
+
+def pagina_adversaria(palavras: int) -> str:
+    return "JOSÉ DA SILVA " * palavras
+
+
+def medir(func, texto: str, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func(texto)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main() -> None:
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    padrao = re.compile(REGEX_PAGAMENTOS)
+    casos = [("página normal", pagina_normal())]
+    casos += [(f"página adversária ({n} palavras)", pagina_adversaria(n)) for n in (250, 500, 1000)]
+    print(f"{'caso':<36}{'re.findall':>14}{'tokenizador':>14}")
+    for nome, texto in casos:
+        if padrao.findall(texto) != tokenizar_pagamentos(texto):
+            raise SystemExit(f"Resultados diferentes em: {nome}")
+        t_re = medir(padrao.findall, texto, repeticoes)
+        t_tok = medir(tokenizar_pagamentos, texto, repeticoes)
+        print(f"{nome:<36}{t_re * 1000:>12.2f}ms{t_tok * 1000:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Execução em lote, sem interface gráfica (não importa PySide6).
+
+Uso:
+    python cli.py PDF_PAGOS PASTA_PROJETOS PASTA_SAIDA [--processos N] [--resumo ARQUIVO.json]
+                  [--exportar PASTA]
+
+O progresso vai para stderr; o resumo da execução (JSON) vai para stdout ou
+para o arquivo de --resumo. Códigos de saída:
+0 = todos os PDFs processados, 1 = algum PDF falhou, 2 = nada processado
+(entrada inválida ou nenhum PDF de projeto).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from multiprocessing import freeze_support
+from typing import List, Optional
+
+from services.orchestrator import STATUS_OK, STATUS_PARCIAL, executar_lote
+
+EXIT_OK = 0
+EXIT_FALHAS = 1
+EXIT_ERRO = 2
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pdffinderpro",
+        description="Compara PDFs de projeto com o PDF de pagamentos e gera os relatórios e o PDF destacado.",
+    )
+    parser.add_argument("pdf_pagos", help="PDF de pagamentos")
+    parser.add_argument("pasta_projetos", help="pasta com os PDFs de projeto")
+    parser.add_argument("pasta_saida", help="pasta base de saída")
+    parser.add_argument("--processos", type=int, default=1, help="PDFs de projeto em paralelo (1 = serial)")
+    parser.add_argument("--resumo", help="grava o resumo JSON neste arquivo em vez de stdout")
+    parser.add_argument("--exportar", help="replica as pastas de saída dos PDFs nesta pasta (ex.: compartilhamento de rede)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+
+    ultimo = [-1]
+
+    def progresso(pct: int) -> None:
+        if pct != ultimo[0]:
+            ultimo[0] = pct
+            print(f"Progresso: {pct}%", file=sys.stderr)
+
+    def erro(nome_pdf: str, mensagem: str) -> None:
+        print(f"Falha em {nome_pdf}: {mensagem}", file=sys.stderr)
+
+    # Saídas de print dos serviços não podem se misturar ao JSON em stdout
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        resumo = executar_lote(
+            args.pdf_pagos, args.pasta_projetos, args.pasta_saida, args.processos,
+            progress_cb=progresso, erro_cb=erro, pasta_exportacao=args.exportar,
+        )
+    finally:
+        sys.stdout = stdout
+
+    texto = json.dumps(resumo, ensure_ascii=False, indent=2)
+    if args.resumo:
+        with open(args.resumo, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    if resumo["erro"]:
+        print(f"Erro: {resumo['erro']}", file=sys.stderr)
+
+    if resumo["status"] == STATUS_OK:
+        return EXIT_OK
+    if resumo["status"] == STATUS_PARCIAL:
+        return EXIT_FALHAS
+    return EXIT_ERRO
+
+
+if __name__ == "__main__":
+    freeze_support()  # necessário para o pool de processos em executáveis congelados
+    sys.exit(main())
@@ -1,2 +1,7 @@
-REGEX_PAGAMENTOS = r"([A-Za-zÁ-Úá-úÂ-Ûâ-ûÃ-Õã-õÇç\s]+)\s+(\d{1,3}(?:\.\d{3})*,\d+\s)"
+# Partes do layout de pagamentos: caracteres de nome (letras, acentos e espaços)
+# e valor no formato 1.234,56 seguido de um espaço
+CLASSE_NOME_PAGAMENTOS = r"A-Za-zÁ-Úá-úÂ-Ûâ-ûÃ-Õã-õÇç\s"
+VALOR_PAGAMENTOS = r"\d{1,3}(?:\.\d{3})*,\d+\s"
+
+REGEX_PAGAMENTOS = rf"([{CLASSE_NOME_PAGAMENTOS}]+)\s+({VALOR_PAGAMENTOS})"
 REGEX_PROJETOS = r" - ([A-Z ]+) \d{3}\.\d{3}\.\d{3}-\d{2}.*?(\d{1,3}(?:\.\d{3})*,\d{2})"
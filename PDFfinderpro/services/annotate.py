@@ -1,11 +1,150 @@
 from __future__ import annotations
 
 import os
-from typing import Callable, List, Optional
+import struct
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pymupdf as fitz  # type: ignore
 
 from constants.filenames import FN_NOMES_NAO_DEST
+from services.name_matcher import AutomatoNomes, normalizar, normalizar_caractere
+from services.page_cache import TIPO_CARACTERES, CachePaginas, abrir_cache_paginas
+from services.totals import RelatorioTxt
+
+
+# Índice da linha no texto da página e bbox
+Caixa = Tuple[int, Tuple[float, float, float, float]]
+# Caractere normalizado e as caixas que ele cobre: uma para cada caractere
+# comum; o espaço que representa uma sequência de brancos cobre uma caixa por
+# linha atravessada (nenhuma no espaço virtual que separa linhas)
+CaracterePagina = Tuple[str, Tuple[Caixa, ...]]
+
+
+def _incluir_branco(caixas: Tuple[Caixa, ...], linha_id: int, bbox) -> Tuple[Caixa, ...]:
+    """Caixas de um espaço colapsado depois de absorver mais um caractere branco."""
+    if caixas and caixas[-1][0] == linha_id:
+        return caixas[:-1] + ((linha_id, tuple(fitz.Rect(caixas[-1][1]) | bbox)),)
+    return caixas + ((linha_id, tuple(bbox)),)
+
+
+def caracteres_pagina(page) -> List[CaracterePagina]:
+    """Extrai, em uma chamada, o fluxo de caracteres da página com coordenadas.
+
+    Segue as regras da busca do MuPDF: fim de linha conta como espaço e
+    espaços repetidos valem como um só, cobrindo a área de todos eles (também
+    os do fim de uma linha, do começo da seguinte e de linhas em branco).
+    """
+    fluxo: List[CaracterePagina] = []
+    linha_id = 0
+    texto = page.get_text("rawdict", flags=fitz.TEXTFLAGS_SEARCH)
+    for bloco in texto.get("blocks", []):
+        for linha in bloco.get("lines", []):
+            for span in linha.get("spans", []):
+                for ch in span.get("chars", []):
+                    c = normalizar_caractere(ch["c"])
+                    if c == " " and (not fluxo or fluxo[-1][0] == " "):
+                        if fluxo:
+                            fluxo[-1] = (" ", _incluir_branco(fluxo[-1][1], linha_id, ch["bbox"]))
+                        continue
+                    fluxo.append((c, ((linha_id, tuple(ch["bbox"])),)))
+            if fluxo and fluxo[-1][0] != " ":
+                fluxo.append((" ", ()))
+            linha_id += 1
+    return fluxo
+
+
+def codificar_fluxo(fluxo: List[CaracterePagina]) -> Optional[bytes]:
+    """Fluxo da página em colunas (texto, caixas por caractere, linhas, bboxes) para o cache de páginas.
+
+    Devolve None se algum caractere não for um único code point (não acontece
+    com o MuPDF, mas aí a página simplesmente não vai para o cache).
+    """
+    texto = "".join(c for c, _ in fluxo)
+    if len(texto) != len(fluxo):
+        return None
+    contagens = array("i", (len(caixas) for _, caixas in fluxo))
+    linhas = array("i")
+    coords = array("d")
+    for _, caixas in fluxo:
+        for linha_id, bbox in caixas:
+            linhas.append(linha_id)
+            coords.extend(bbox)
+    texto_bytes = texto.encode("utf-8")
+    return b"".join([
+        struct.pack("<III", len(fluxo), len(texto_bytes), len(linhas)),
+        texto_bytes, contagens.tobytes(), linhas.tobytes(), coords.tobytes(),
+    ])
+
+
+def decodificar_fluxo(dados: bytes) -> List[CaracterePagina]:
+    n, n_texto, n_caixas = struct.unpack_from("<III", dados)
+    pos = struct.calcsize("<III")
+    texto = dados[pos:pos + n_texto].decode("utf-8")
+    pos += n_texto
+    contagens = array("i")
+    contagens.frombytes(dados[pos:pos + 4 * n])
+    pos += 4 * n
+    linhas = array("i")
+    linhas.frombytes(dados[pos:pos + 4 * n_caixas])
+    pos += 4 * n_caixas
+    coords = array("d")
+    coords.frombytes(dados[pos:pos + 32 * n_caixas])
+    valores = iter(coords.tolist())
+    caixas = iter(zip(linhas.tolist(), zip(valores, valores, valores, valores)))
+    fluxo: List[CaracterePagina] = []
+    for c, k in zip(texto, contagens.tolist()):
+        if k == 1:
+            fluxo.append((c, (next(caixas),)))
+        else:
+            fluxo.append((c, tuple(next(caixas) for _ in range(k))))
+    return fluxo
+
+
+def _fluxo_pagina(pdf, indice: int, cache: Optional[CachePaginas], documento: Optional[str]):
+    """(fluxo de caracteres, página carregada ou None quando o fluxo veio do cache)."""
+    if cache is not None:
+        dados = cache.obter(documento, indice + 1, TIPO_CARACTERES)
+        if dados is not None:
+            return decodificar_fluxo(dados), None
+    page = pdf[indice]
+    fluxo = caracteres_pagina(page)
+    if cache is not None:
+        codificado = codificar_fluxo(fluxo)
+        if codificado is not None:
+            cache.gravar(documento, indice + 1, TIPO_CARACTERES, codificado)
+    return fluxo, page
+
+
+def _retangulos(fluxo: List[CaracterePagina], inicio: int, fim: int) -> List[fitz.Rect]:
+    """Um retângulo por linha coberta pelo trecho [inicio, fim) do fluxo."""
+    por_linha: Dict[int, fitz.Rect] = {}
+    for _, caixas in fluxo[inicio:fim]:
+        for linha_id, bbox in caixas:
+            if linha_id in por_linha:
+                por_linha[linha_id] |= bbox
+            else:
+                por_linha[linha_id] = fitz.Rect(bbox)
+    return list(por_linha.values())
+
+
+def localizar_nomes(fluxo: List[CaracterePagina], automato: AutomatoNomes) -> Dict[int, List[fitz.Rect]]:
+    """Retângulos de cada padrão do autômato encontrados no fluxo da página.
+
+    Ocorrências encostadas do mesmo padrão viram um único trecho, como no
+    resultado de `page.search_for`.
+    """
+    texto = "".join(c for c, _ in fluxo)
+    areas: Dict[int, List[fitz.Rect]] = {}
+    for pid, hits in automato.buscar_sem_sobreposicao(texto).items():
+        trechos: List[List[int]] = []
+        for inicio, fim in hits:
+            if trechos and trechos[-1][1] == inicio:
+                trechos[-1][1] = fim
+            else:
+                trechos.append([inicio, fim])
+        areas[pid] = [r for inicio, fim in trechos for r in _retangulos(fluxo, inicio, fim)]
+    return areas
 
 
 def anotar_pdf(
@@ -20,41 +159,77 @@ def anotar_pdf(
         for line in f:
             if ":" in line:
                 nomes.append(line.split(":")[0].strip())
+    return anotar_pdf_nomes(pdf_path, nomes, output_pdf_path, progress_cb)
+
+
+def anotar_pdf_nomes(
+    pdf_path: str,
+    nomes: List[str],
+    output_pdf_path: str,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    totais: bool = False,
+    cache_dir: Optional[str] = None,
+) -> Optional[str]:
+    """Igual a anotar_pdf, recebendo a lista de nomes já em memória.
+
+    Com totais=True, 'nomes_nao_destacados.txt' já sai com o cabeçalho "Total:".
+    Com cache_dir, o fluxo de caracteres de cada página vem do cache de
+    páginas, e só as páginas que recebem destaque são carregadas.
+    """
+    # Cada nome vira um padrão normalizado; nomes que normalizam igual
+    # compartilham o padrão (e os mesmos destaques, como no search_for).
+    padroes: List[str] = []
+    padrao_por_nome: Dict[str, int] = {}
+    ids_padrao: Dict[str, int] = {}
+    for nome in nomes:
+        if nome in padrao_por_nome:
+            continue
+        padrao = normalizar(nome)
+        if not padrao:
+            continue
+        if padrao not in ids_padrao:
+            ids_padrao[padrao] = len(padroes)
+            padroes.append(padrao)
+        padrao_por_nome[nome] = ids_padrao[padrao]
+    automato = AutomatoNomes(padroes)
 
     nomes_nao_destacados = set(nomes)
+    cache = abrir_cache_paginas(cache_dir)
     try:
+        documento = cache.documento(pdf_path) if cache else None
         with fitz.open(pdf_path) as pdf:
             total_pages = max(1, len(pdf))
-            for page_num, page in enumerate(pdf, start=1):
+            for page_num in range(1, len(pdf) + 1):
+                fluxo, page = _fluxo_pagina(pdf, page_num - 1, cache, documento)
+                areas_por_padrao = localizar_nomes(fluxo, automato)
                 for nome in nomes:
-                    areas = page.search_for(nome)
-                    if areas:
-                        if nome in nomes_nao_destacados:
-                            nomes_nao_destacados.discard(nome)
-                        for area in areas:
-                            page.add_highlight_annot(area)
-                for nome in list(nomes_nao_destacados):
-                    areas = page.search_for(nome)
+                    pid = padrao_por_nome.get(nome)
+                    areas = areas_por_padrao.get(pid) if pid is not None else None
                     if areas:
                         nomes_nao_destacados.discard(nome)
+                        if page is None:
+                            page = pdf[page_num - 1]
                         for area in areas:
-                            page.add_underline_annot(area)
+                            page.add_highlight_annot(area)
                 if progress_cb:
                     progress_cb(int(100 * page_num / total_pages))
             pdf.save(output_pdf_path)
     except Exception as e:
         print(f"Erro ao processar PDF para destaque: {e}")
         return None
+    finally:
+        if cache:
+            cache.close()
 
     if nomes_nao_destacados:
         nomes_nao_encontrados_path = os.path.join(os.path.dirname(output_pdf_path), FN_NOMES_NAO_DEST)
         try:
             nomes_nao_destacados_lista = sorted(list(nomes_nao_destacados))
-            with open(nomes_nao_encontrados_path, "w", encoding="utf-8") as f:
+            with RelatorioTxt(nomes_nao_encontrados_path, totais) as f:
                 total_nomes = len(nomes_nao_destacados_lista)
-                f.write(f"Total de nomes não encontrados: {total_nomes}\n")
+                f.escrever(f"Total de nomes não encontrados: {total_nomes}\n")
                 for nome in nomes_nao_destacados_lista:
-                    f.write(f"{nome}\n")
+                    f.escrever(f"{nome}\n")
             return nomes_nao_encontrados_path
         except Exception as e:
             print(f"Erro ao salvar nomes não encontrados: {e}")
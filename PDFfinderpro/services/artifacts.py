@@ -3,7 +3,95 @@ from __future__ import annotations
 import os
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+def mesmo_arquivo(a: str, b: str) -> bool:
+    """True se os dois caminhos apontam para o mesmo arquivo (inclusive hardlinks)."""
+    if os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b)):
+        return True
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def publicar_arquivo(origem: str, destino: str, mover: bool = False) -> bool:
+    """Coloca `origem` em `destino` sem deixar um arquivo parcial no caminho final.
+
+    Não faz nada se os dois já são o mesmo arquivo. Com mover=True usa
+    os.replace (rename na mesma unidade); sem ele, tenta um hardlink e só
+    copia quando o link não é possível (outra unidade, compartilhamento de
+    rede). Retorna False quando nada precisou ser feito.
+    """
+    if mesmo_arquivo(origem, destino):
+        return False
+    if mover:
+        try:
+            os.replace(origem, destino)
+            return True
+        except OSError:
+            pass  # outra unidade: copia e remove a origem
+    tmp = f"{destino}.tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    try:
+        try:
+            os.link(origem, tmp)
+        except OSError:
+            shutil.copy2(origem, tmp)
+        os.replace(tmp, destino)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        raise
+    if mover:
+        os.remove(origem)
+    return True
+
+
+class ArtefatosPdf:
+    """Artefatos de um PDF de projeto e onde cada um está.
+
+    Os arquivos são gravados em `pasta_trabalho` (por padrão a própria
+    pasta_saida) nos caminhos devolvidos por `caminho`. `publicar` leva para
+    pasta_saida o que foi gerado em outra pasta de trabalho, e `exportar`
+    replica a pasta_saida em outro destino. Artefatos que já estão no lugar
+    não são copiados; um artefato registrado que não foi gerado nesta execução
+    tem a cópia antiga removida do destino.
+    """
+
+    def __init__(self, pasta_saida: str, pasta_trabalho: Optional[str] = None) -> None:
+        self.pasta_saida = str(pasta_saida)
+        self.pasta_trabalho = str(pasta_trabalho) if pasta_trabalho else self.pasta_saida
+        self.nomes: List[str] = []
+
+    def caminho(self, nome_arquivo: str) -> str:
+        """Caminho de trabalho do artefato `nome_arquivo` (registrando-o)."""
+        if nome_arquivo not in self.nomes:
+            self.nomes.append(nome_arquivo)
+        return str(Path(self.pasta_trabalho, nome_arquivo))
+
+    def _sincronizar(self, pasta_origem: str, pasta_destino: str, mover: bool) -> List[str]:
+        os.makedirs(pasta_destino, exist_ok=True)
+        copiados: List[str] = []
+        for nome in self.nomes:
+            origem = str(Path(pasta_origem, nome))
+            destino = str(Path(pasta_destino, nome))
+            if os.path.exists(origem):
+                if publicar_arquivo(origem, destino, mover):
+                    copiados.append(destino)
+            elif os.path.exists(destino) and not mesmo_arquivo(origem, destino):
+                os.remove(destino)
+        return copiados
+
+    def publicar(self) -> List[str]:
+        """Move os artefatos da pasta de trabalho para pasta_saida; retorna os que mudaram de lugar."""
+        return self._sincronizar(self.pasta_trabalho, self.pasta_saida, mover=True)
+
+    def exportar(self, pasta_exportacao: str) -> List[str]:
+        """Replica os artefatos de pasta_saida em pasta_exportacao; retorna os arquivos gravados."""
+        return self._sincronizar(self.pasta_saida, pasta_exportacao, mover=False)
 
 
 def salvar_arquivos_na_pasta(
@@ -20,24 +108,20 @@ def salvar_arquivos_na_pasta(
     if not pasta_saida:
         return None
     try:
-        novo_output_pagos = Path(pasta_saida, Path(output_pagos).name)
-        novo_output_projeto = Path(pasta_saida, Path(output_projeto).name)
-        novo_arquivo_saida_path = Path(pasta_saida, Path(arquivo_saida_path).name)
-        novo_arquivo_saida_exato = Path(pasta_saida, Path(arquivo_saida_exato).name)
-        novo_arquivo_saida_diferente = Path(pasta_saida, Path(arquivo_saida_diferente).name)
-        novo_output_pdf = Path(pasta_saida, Path(output_pdf).name)
-        novo_arquivo_nomes_nao_encontrados = Path(pasta_saida, Path(arquivo_nomes_nao_encontrados).name)
-
-        shutil.copy2(output_pagos, novo_output_pagos)
-        shutil.copy2(output_projeto, novo_output_projeto)
-        shutil.copy2(arquivo_saida_path, novo_arquivo_saida_path)
-        shutil.copy2(arquivo_saida_exato, novo_arquivo_saida_exato)
-        shutil.copy2(arquivo_saida_diferente, novo_arquivo_saida_diferente)
-        shutil.copy2(output_pdf, novo_output_pdf)
+        origens = [
+            output_pagos,
+            output_projeto,
+            arquivo_saida_path,
+            arquivo_saida_exato,
+            arquivo_saida_diferente,
+            output_pdf,
+            arquivo_nomes_nao_encontrados,
+        ]
         if nomes_nao_encontrados_path and os.path.exists(nomes_nao_encontrados_path):
-            novo_nomes_nao_encontrados_path = Path(pasta_saida, Path(nomes_nao_encontrados_path).name)
-            shutil.copy2(nomes_nao_encontrados_path, novo_nomes_nao_encontrados_path)
-        shutil.copy2(arquivo_nomes_nao_encontrados, novo_arquivo_nomes_nao_encontrados)
+            origens.append(nomes_nao_encontrados_path)
+        for origem in origens:
+            # Arquivos que já estão em pasta_saida não são copiados sobre si mesmos
+            publicar_arquivo(origem, str(Path(pasta_saida, Path(origem).name)))
         return pasta_saida
     except Exception as e:
         print(f"Erro ao salvar os arquivos na pasta: {e}")
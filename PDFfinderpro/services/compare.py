@@ -1,12 +1,137 @@
 from __future__ import annotations
 
 import re
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from tqdm import tqdm
 
+from services.prefix_index import IndicePrefixosPorValor
+from services.value_index import IndicePorValor
 from utils.names import gerar_prefixos_nome
 
+# (nome, valor) como aparece em uma linha "nome: valor" dos txt
+Registro = Tuple[str, str]
+
+_LINHA_REGISTRO = re.compile(r"(.+?):\s*([\d,.]+)")
+_VALOR_CANONICO = re.compile(r"[\d,.]+")
+_ENCONTRADO_COMO = re.compile(r"Encontrado como:\s*(.*?):\s*([\d,.]+)")
+
+
+def registro_da_linha(linha: str) -> Optional[Registro]:
+    m = _LINHA_REGISTRO.match(linha)
+    if m:
+        return m.group(1).strip(), m.group(2).strip()
+    return None
+
+
+def ler_registros(arquivo_path: str) -> List[Registro]:
+    with open(arquivo_path, 'r', encoding='utf-8') as f:
+        return [r for r in map(registro_da_linha, f) if r is not None]
+
+
+def registros_de_dados(dados: Dict[str, str]) -> List[Registro]:
+    """Registros de `dados` em ordem de nome, sem passar por arquivo.
+
+    O resultado é o mesmo de gravar "nome: valor" por linha e reler o txt com
+    ler_registros. Nomes de pagamentos podem conter quebras de linha (a classe
+    de nome aceita \\s); nesses casos, raros, a linha é reinterpretada como
+    seria lida do disco.
+    """
+    registros: List[Registro] = []
+    for nome, valor in sorted(dados.items()):
+        if nome and ":" not in nome and "\n" not in nome and "\r" not in nome \
+                and _VALOR_CANONICO.fullmatch(valor):
+            registros.append((nome.strip(), valor))
+            continue
+        texto = f"{nome}: {valor}\n".replace("\r\n", "\n").replace("\r", "\n")
+        for linha in texto.split("\n"):
+            registro = registro_da_linha(linha)
+            if registro is not None:
+                registros.append(registro)
+    return registros
+
+
+def linhas_de_registros(registros: Iterable[Registro]) -> List[str]:
+    return [f"{nome}: {valor}\n" for nome, valor in registros]
+
+
+def filtrar_busca_parcial(
+    dados1: Dict[str, str],
+    registros2: Sequence[Registro],
+    progress_cb: Optional[Callable[[int], None]] = None,
+) -> List[Registro]:
+    """Registros de registros2 cujo nome tem um prefixo contido em um nome de dados1 de mesmo valor."""
+    indice = IndicePorValor(dados1)
+    encontrados: List[Registro] = []
+    total = max(1, len(registros2))
+    for idx, (nome2_completo, valor2) in enumerate(registros2, start=1):
+        partes_nome2 = nome2_completo.split()
+        # Todo prefixo de palavras contém a primeira palavra, então
+        # "algum prefixo está em um nome de mesmo valor" equivale a
+        # "a primeira palavra está em um nome de mesmo valor".
+        if partes_nome2 and indice.contem(partes_nome2[0], valor2):
+            encontrados.append((nome2_completo, valor2))
+        if progress_cb:
+            progress_cb(int(100 * idx / total))
+    return encontrados
+
+
+def comparar_registros(
+    dados1: Dict[str, str],
+    registros2: Sequence[Registro],
+    progress_cb: Optional[Callable[[int], None]] = None,
+) -> Tuple[List[Registro], List[str], List[Registro], List[Registro]]:
+    """Comparação exata e, para o que sobrar, por prefixo único de mesmo valor.
+
+    Retorna (exatos, linhas do relatório de nomes diferentes, não encontrados,
+    encontrados como), onde "encontrados como" são os nomes de dados1 achados
+    pela busca por prefixo.
+    """
+    exatos: List[Registro] = []
+    nomes_nao_encontrados: List[Registro] = []
+    total = max(1, len(registros2))
+    for idx, (nome2_completo, valor2) in enumerate(registros2, start=1):
+        if nome2_completo in dados1 and dados1[nome2_completo] == valor2:
+            exatos.append((nome2_completo, valor2))
+        else:
+            nomes_nao_encontrados.append((nome2_completo, valor2))
+        if progress_cb:
+            progress_cb(int(100 * idx / total))
+
+    indice_prefixos = IndicePrefixosPorValor(dados1)
+
+    diferentes: List[str] = []
+    nao_encontrados: List[Registro] = []
+    encontrados_como: List[Registro] = []
+    for nome_original, valor_original in tqdm(nomes_nao_encontrados, desc="Comparando arquivos (Parcial)"):
+        encontrado = False
+        for prefixo in gerar_prefixos_nome(nome_original):
+            nome_encontrado = indice_prefixos.unico(prefixo, valor_original)
+            if nome_encontrado is not None:
+                diferentes.append(
+                    f"Original: {nome_original}: {valor_original}\nEncontrado como: {nome_encontrado}: {valor_original}\n"
+                )
+                encontrados_como.append((nome_encontrado, valor_original))
+                encontrado = True
+                break
+        if not encontrado:
+            diferentes.append(
+                f"Original: {nome_original}: {valor_original} -> Nenhuma correspondência única encontrada\n"
+            )
+            nao_encontrados.append((nome_original, valor_original))
+    return exatos, diferentes, nao_encontrados, encontrados_como
+
+
+def nomes_encontrados_como(linhas: Iterable[str]) -> List[Registro]:
+    """(nome, valor) das linhas "Encontrado como" de um relatório de nomes diferentes."""
+    registros: List[Registro] = []
+    for linha in linhas:
+        if "Encontrado como" in linha:
+            m = _ENCONTRADO_COMO.match(linha.strip())
+            if m:
+                registros.append((m.group(1).strip(), m.group(2).strip()))
+    return registros
+
 
 def comparar_busca_parcial(
     arquivo1_path: str,
@@ -15,36 +140,10 @@ def comparar_busca_parcial(
     progress_cb: Optional[Callable[[int], None]] = None,
 ) -> None:
     try:
-        with open(arquivo1_path, 'r', encoding='utf-8') as a1, \
-             open(arquivo2_path, 'r', encoding='utf-8') as a2, \
-             open(arquivo_saida_path, 'w', encoding='utf-8') as out:
-
-            dados_arquivo1: Dict[str, str] = {}
-            for linha in a1:
-                m = re.match(r"(.+?):\s*([\d,.]+)", linha)
-                if m:
-                    dados_arquivo1[m.group(1).strip()] = m.group(2).strip()
-
-            linhas = a2.readlines()
-            total = max(1, len(linhas))
-            for idx, linha in enumerate(linhas, start=1):
-                m = re.match(r"(.+?):\s*([\d,.]+)", linha)
-                if m:
-                    nome2_completo = m.group(1).strip()
-                    valor2 = m.group(2).strip()
-                    partes_nome2 = nome2_completo.split()
-                    encontrado = False
-                    for i in range(len(partes_nome2), 0, -1):
-                        nome2_parcial = " ".join(partes_nome2[:i])
-                        for nome1, valor1 in dados_arquivo1.items():
-                            if nome2_parcial in nome1 and valor1 == valor2:
-                                out.write(linha)
-                                encontrado = True
-                                break
-                        if encontrado:
-                            break
-                if progress_cb:
-                    progress_cb(int(100 * idx / total))
+        dados_arquivo1 = dict(ler_registros(arquivo1_path))
+        encontrados = filtrar_busca_parcial(dados_arquivo1, ler_registros(arquivo2_path), progress_cb)
+        with open(arquivo_saida_path, 'w', encoding='utf-8') as out:
+            out.writelines(linhas_de_registros(encontrados))
     except FileNotFoundError:
         print("Erro: Um ou ambos os arquivos de entrada não foram encontrados.")
     except Exception as e:
@@ -60,52 +159,16 @@ def comparar_exata_e_parcial(
     progress_cb: Optional[Callable[[int], None]] = None,
 ) -> None:
     try:
-        dados_arquivo1: Dict[str, str] = {}
-        with open(arquivo1_path, 'r', encoding='utf-8') as arquivo1:
-            for linha in arquivo1:
-                m = re.match(r"(.+?):\s*([\d,.]+)", linha)
-                if m:
-                    dados_arquivo1[m.group(1).strip()] = m.group(2).strip()
-
-        nomes_nao_encontrados: List[Tuple[str, str]] = []
-
-        with open(arquivo2_path, 'r', encoding='utf-8') as arquivo2, \
-             open(arquivo_saida_exato, 'w', encoding='utf-8') as saida_exato:
-            linhas = arquivo2.readlines()
-            total = max(1, len(linhas))
-            for idx, linha in enumerate(linhas, start=1):
-                m = re.match(r"(.+?):\s*([\d,.]+)", linha)
-                if m:
-                    nome2_completo = m.group(1).strip()
-                    valor2 = m.group(2).strip()
-                    if nome2_completo in dados_arquivo1 and dados_arquivo1[nome2_completo] == valor2:
-                        saida_exato.write(linha)
-                    else:
-                        nomes_nao_encontrados.append((nome2_completo, valor2))
-                if progress_cb:
-                    progress_cb(int(100 * idx / total))
-
+        dados_arquivo1 = dict(ler_registros(arquivo1_path))
+        exatos, diferentes, nao_encontrados, _ = comparar_registros(
+            dados_arquivo1, ler_registros(arquivo2_path), progress_cb
+        )
+        with open(arquivo_saida_exato, 'w', encoding='utf-8') as saida_exato:
+            saida_exato.writelines(linhas_de_registros(exatos))
         with open(arquivo_nomes_nao_encontrados, 'w', encoding='utf-8') as f_nao, \
              open(arquivo_saida_diferente, 'w', encoding='utf-8') as f_dif:
-            for nome_original, valor_original in tqdm(nomes_nao_encontrados, desc="Comparando arquivos (Parcial)"):
-                encontrado = False
-                for prefixo in gerar_prefixos_nome(nome_original):
-                    correspondencias = [
-                        nome for nome, valor in dados_arquivo1.items()
-                        if nome.startswith(prefixo) and valor == valor_original
-                    ]
-                    if len(correspondencias) == 1:
-                        nome_encontrado = correspondencias[0]
-                        f_dif.write(
-                            f"Original: {nome_original}: {valor_original}\nEncontrado como: {nome_encontrado}: {valor_original}\n"
-                        )
-                        encontrado = True
-                        break
-                if not encontrado:
-                    f_dif.write(
-                        f"Original: {nome_original}: {valor_original} -> Nenhuma correspondência única encontrada\n"
-                    )
-                    f_nao.write(f"{nome_original}: {valor_original}\n")
+            f_dif.writelines(diferentes)
+            f_nao.writelines(linhas_de_registros(nao_encontrados))
     except FileNotFoundError as e:
         print(f"Erro: Arquivo não encontrado - {e.filename}")
     except Exception as e:
@@ -119,18 +182,11 @@ def adicionar_nomes_encontrados(
 ) -> None:
     try:
         with open(arquivo_entrada_path, 'r', encoding='utf-8') as ent:
-            linhas = ent.readlines()
-        total = max(1, len(linhas))
+            encontrados = nomes_encontrados_como(ent)
         with open(arquivo_saida_path, 'a', encoding='utf-8') as sai:
-            for idx, linha in enumerate(linhas, start=1):
-                if "Encontrado como" in linha:
-                    m = re.match(r"Encontrado como:\s*(.*?):\s*([\d,.]+)", linha.strip())
-                    if m:
-                        nome = m.group(1).strip()
-                        valor = m.group(2).strip()
-                        sai.write(f"{nome}: {valor}\n")
-                if progress_cb:
-                    progress_cb(int(100 * idx / total))
+            sai.writelines(linhas_de_registros(encontrados))
+        if progress_cb:
+            progress_cb(100)
     except FileNotFoundError as e:
         print(f"Erro: Arquivo não encontrado - {e.filename}")
     except Exception as e:
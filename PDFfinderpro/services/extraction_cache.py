@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+from constants.regex import REGEX_PAGAMENTOS
+from services.page_cache import abrir_cache_paginas
+from services.pdf_extraction import extrair_pagos
+
+# Pasta (relativa à pasta base de saída) onde o cache de páginas fica guardado
+PASTA_CACHE = ".cache"
+
+
+def extrair_pagos_cache(
+    pdf_path: str,
+    regex: str = REGEX_PAGAMENTOS,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, str]:
+    """Igual a extrair_pagos, mas lendo o texto das páginas do cache em cache_dir.
+
+    Só as páginas de um PDF que ainda não passou pelo cache (ou que mudou de
+    conteúdo) são extraídas de novo. Sem cache_dir, apenas delega para
+    extrair_pagos.
+    """
+    cache = abrir_cache_paginas(cache_dir)
+    if cache is None:
+        return extrair_pagos(pdf_path, regex, progress_cb)
+    with cache:
+        return extrair_pagos(pdf_path, regex, progress_cb, cache)
@@ -0,0 +1,86 @@
+"""
+Busca simultânea de vários nomes em um texto (Aho–Corasick).
+
+A normalização imita a busca do MuPDF (`page.search_for`): maiúsculas ASCII
+viram minúsculas e qualquer sequência de espaços vale como um único espaço.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+def normalizar_caractere(c: str) -> str:
+    if c.isspace():
+        return " "
+    if "A" <= c <= "Z":
+        return chr(ord(c) + 32)
+    return c
+
+
+def normalizar(texto: str) -> str:
+    """Normaliza um padrão: minúsculas ASCII e espaços colapsados, sem bordas."""
+    return " ".join("".join(normalizar_caractere(c) for c in texto).split())
+
+
+class AutomatoNomes:
+    """Autômato de Aho–Corasick sobre caracteres para uma lista de padrões.
+
+    Uma única passada pelo texto encontra todas as ocorrências de todos os
+    padrões, em vez de uma busca completa por padrão.
+    """
+
+    def __init__(self, padroes: List[str]) -> None:
+        self.padroes = padroes
+        self._trans: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._saida: List[List[int]] = [[]]
+
+        for pid, padrao in enumerate(padroes):
+            if not padrao:
+                continue
+            no = 0
+            for c in padrao:
+                prox = self._trans[no].get(c)
+                if prox is None:
+                    prox = len(self._trans)
+                    self._trans[no][c] = prox
+                    self._trans.append({})
+                    self._falha.append(0)
+                    self._saida.append([])
+                no = prox
+            self._saida[no].append(pid)
+
+        fila = deque(self._trans[0].values())
+        while fila:
+            no = fila.popleft()
+            for c, filho in self._trans[no].items():
+                fila.append(filho)
+                f = self._falha[no]
+                while f and c not in self._trans[f]:
+                    f = self._falha[f]
+                destino = self._trans[f].get(c, 0)
+                self._falha[filho] = destino if destino != filho else 0
+                self._saida[filho] = self._saida[filho] + self._saida[self._falha[filho]]
+
+    def buscar(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Gera (início, id do padrão) para cada ocorrência, em ordem de fim."""
+        trans, falha, saida, padroes = self._trans, self._falha, self._saida, self.padroes
+        no = 0
+        for i, c in enumerate(texto):
+            while no and c not in trans[no]:
+                no = falha[no]
+            no = trans[no].get(c, 0)
+            for pid in saida[no]:
+                yield i + 1 - len(padroes[pid]), pid
+
+    def buscar_sem_sobreposicao(self, texto: str) -> Dict[int, List[Tuple[int, int]]]:
+        """Ocorrências (início, fim) por padrão, sem sobreposição e da esquerda para a
+        direita, como em buscas repetidas de um único padrão."""
+        resultado: Dict[int, List[Tuple[int, int]]] = {}
+        for inicio, pid in self.buscar(texto):
+            hits = resultado.setdefault(pid, [])
+            if hits and inicio < hits[-1][1]:
+                continue
+            hits.append((inicio, inicio + len(self.padroes[pid])))
+        return resultado
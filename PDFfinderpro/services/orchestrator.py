@@ -0,0 +1,160 @@
+"""
+Execução completa de um lote, sem dependência de Qt.
+
+Usado tanto pela thread da interface (workers/process_worker.py) quanto pela
+linha de comando (cli.py). Mensagens e falhas chegam por callbacks; o
+resultado é um resumo em dicionário, serializável em JSON.
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from constants.regex import REGEX_PAGAMENTOS
+from services.extraction_cache import PASTA_CACHE, extrair_pagos_cache
+from services.pipeline import (
+    ETAPAS_POR_PDF,
+    criar_pasta_saida_por_pdf,
+    processar_em_paralelo,
+    processar_pdf_projeto,
+)
+
+# Status do resumo
+STATUS_OK = "ok"
+STATUS_PARCIAL = "parcial"  # concluído, mas algum PDF falhou
+STATUS_ERRO = "erro"        # nada foi processado
+
+
+def listar_pdfs_projeto(pdf_projetos_dir: str) -> List[str]:
+    """PDFs de projeto da pasta, em ordem de nome (execuções reproduzíveis)."""
+    return [
+        str(Path(pdf_projetos_dir, f))
+        for f in sorted(os.listdir(pdf_projetos_dir))
+        if f.lower().endswith('.pdf')
+    ]
+
+
+def executar_lote(
+    pdf_pagos_path: str,
+    pdf_projetos_dir: str,
+    base_output_dir: str,
+    max_workers: int = 1,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    erro_cb: Optional[Callable[[str, str], None]] = None,
+    pasta_exportacao: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Processa todos os PDFs de projeto contra o PDF de pagamentos.
+
+    progress_cb recebe o percentual geral (0..100); erro_cb recebe (nome do
+    PDF, mensagem) para falhas que não interrompem o lote. Com
+    pasta_exportacao, a pasta de cada PDF também é replicada lá. Retorna o
+    resumo da execução (status, PDFs concluídos, falhas, duração).
+    """
+    inicio = time.monotonic()
+    max_workers = max(1, max_workers)
+    resumo: Dict[str, Any] = {
+        "status": STATUS_OK,
+        "pdf_pagos": os.path.abspath(pdf_pagos_path),
+        "pasta_projetos": os.path.abspath(pdf_projetos_dir),
+        "pasta_saida": os.path.abspath(base_output_dir),
+        "pasta_exportacao": os.path.abspath(pasta_exportacao) if pasta_exportacao else None,
+        "processos": max_workers,
+        "total_pdfs": 0,
+        "registros_pagos": 0,
+        "concluidos": [],
+        "falhas": [],
+        "erro": None,
+        "duracao_s": 0.0,
+    }
+
+    def finalizar(erro: Optional[str] = None) -> Dict[str, Any]:
+        if erro is not None:
+            resumo["status"] = STATUS_ERRO
+            resumo["erro"] = erro
+        elif resumo["falhas"]:
+            resumo["status"] = STATUS_PARCIAL if resumo["concluidos"] else STATUS_ERRO
+        resumo["duracao_s"] = round(time.monotonic() - inicio, 3)
+        return resumo
+
+    def falhar(nome_pdf: str, mensagem: str) -> None:
+        print(f"Erro ao processar '{nome_pdf}': {mensagem}")
+        resumo["falhas"].append({"pdf": nome_pdf, "erro": mensagem})
+        if erro_cb:
+            erro_cb(nome_pdf, mensagem)
+
+    if not os.path.isfile(pdf_pagos_path):
+        return finalizar(f"PDF de pagamentos não encontrado: {pdf_pagos_path}")
+    if not os.path.isdir(pdf_projetos_dir):
+        return finalizar(f"Pasta de projetos não encontrada: {pdf_projetos_dir}")
+    pdf_projetos_files = listar_pdfs_projeto(pdf_projetos_dir)
+    if not pdf_projetos_files:
+        return finalizar("Não foram encontrados arquivos PDF na pasta selecionada.")
+    resumo["total_pdfs"] = len(pdf_projetos_files)
+
+    # Etapa única: o PDF de pagamentos é extraído uma vez por execução (e as
+    # páginas são reaproveitadas entre execuções enquanto o conteúdo não mudar)
+    total_stages = 1 + len(pdf_projetos_files) * ETAPAS_POR_PDF
+
+    def progresso_etapa(current_stage: int, pct: int) -> None:
+        if progress_cb:
+            base = (current_stage - 1) / total_stages
+            progress_cb(int(100 * (base + (pct / 100) / total_stages)))
+
+    # O cache de páginas do PDF de pagamentos é compartilhado pela extração e
+    # pelo destaque de todos os PDFs de projeto
+    pasta_cache = str(Path(base_output_dir, PASTA_CACHE))
+    progresso_etapa(1, 0)
+    dados_pagos = extrair_pagos_cache(
+        pdf_pagos_path,
+        REGEX_PAGAMENTOS,
+        lambda pct: progresso_etapa(1, pct),
+        cache_dir=pasta_cache,
+    )
+    resumo["registros_pagos"] = len(dados_pagos)
+
+    tarefas: List[Tuple[int, str, str]] = []
+    for idx, pdf_todos in enumerate(pdf_projetos_files):
+        pasta_saida = criar_pasta_saida_por_pdf(pdf_todos, base_output_dir)
+        if not pasta_saida:
+            falhar(Path(pdf_todos).name, "Não foi possível criar a pasta de saída.")
+            continue
+        tarefas.append((idx, pdf_todos, pasta_saida))
+
+    if max_workers > 1 and len(tarefas) > 1:
+        # Fração concluída (0..1) de cada PDF, agregada em um único percentual
+        fracoes: Dict[int, float] = {idx: 0.0 for idx, _, _ in tarefas}
+        ultimo = [-1]
+
+        def prog_paralelo(idx: int, etapa: int, pct: int) -> None:
+            fracoes[idx] = ((etapa - 1) + pct / 100) / ETAPAS_POR_PDF
+            concluidas = 1 + ETAPAS_POR_PDF * sum(fracoes.values())
+            valor = int(100 * concluidas / total_stages)
+            if valor != ultimo[0] and progress_cb:
+                ultimo[0] = valor
+                progress_cb(valor)
+
+        concluidos = processar_em_paralelo(
+            tarefas, pdf_pagos_path, dados_pagos, max_workers,
+            progress_cb=prog_paralelo, erro_cb=falhar,
+            pasta_exportacao=pasta_exportacao, pasta_cache=pasta_cache,
+        )
+    else:
+        concluidos = []
+        for idx, pdf_todos, pasta_saida in tarefas:
+            base_stage = 1 + idx * ETAPAS_POR_PDF
+
+            def prog(etapa: int, pct: int, base_stage: int = base_stage) -> None:
+                progresso_etapa(base_stage + etapa, pct)
+
+            try:
+                processar_pdf_projeto(
+                    pdf_todos, pdf_pagos_path, dados_pagos, pasta_saida, prog, pasta_exportacao, pasta_cache
+                )
+                concluidos.append(idx)
+            except Exception as e:
+                falhar(Path(pdf_todos).name, f"{type(e).__name__}: {e}")
+
+    resumo["concluidos"] = [Path(pdf_projetos_files[idx]).name for idx in concluidos]
+    return finalizar()
@@ -0,0 +1,206 @@
+"""
+Cache em disco (SQLite) do conteúdo extraído de cada página de um PDF.
+
+A chave é o hash do conteúdo do documento e o número da página, então o
+cache continua válido se o PDF for copiado ou movido e deixa de valer assim
+que o arquivo muda. O hash de um caminho é guardado junto com tamanho e
+mtime, para não reler o PDF inteiro a cada execução. Cada tipo de conteúdo
+define como vira bytes (comprimidos com zlib); nada é gravado com pickle,
+já que a pasta de saída pode ficar em um compartilhamento de rede.
+
+Falhas do cache (banco bloqueado, disco cheio...) nunca interrompem o
+processamento: o cache é desativado e a página é extraída normalmente.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+ARQUIVO_CACHE_PAGINAS = "paginas.sqlite3"
+# Incrementar quando o formato de algum tipo mudar; o cache antigo é descartado
+VERSAO_CACHE_PAGINAS = 2
+
+# Páginas acumuladas em memória antes de cada gravação no banco. A trava de
+# escrita do SQLite só é tomada durante a gravação do lote, então outros
+# processos do pool não esperam pelo documento inteiro.
+LOTE_GRAVACAO = 16
+
+# Tipos de conteúdo por página
+TIPO_TEXTO = "texto"            # page.get_text("text"), usado por extrair_pagos
+TIPO_CARACTERES = "caracteres"  # annotate.caracteres_pagina, usado pelo destaque
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS paginas (
+    hash TEXT NOT NULL,
+    pagina INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    dados BLOB NOT NULL,
+    PRIMARY KEY (hash, pagina, tipo)
+);
+"""
+
+
+def codificar_texto(texto: str) -> bytes:
+    return texto.encode("utf-8")
+
+
+def decodificar_texto(dados: bytes) -> str:
+    return dados.decode("utf-8")
+
+
+def hash_arquivo(path: str, bloco: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+class CachePaginas:
+    def __init__(self, cache_dir: str) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = str(Path(cache_dir, ARQUIVO_CACHE_PAGINAS))
+        # Vários processos do pool podem usar o mesmo arquivo; sem WAL, que
+        # não funciona em compartilhamentos de rede (as gravações em lote
+        # mantêm as travas curtas)
+        self._con: Optional[sqlite3.Connection] = sqlite3.connect(self.path, timeout=30)
+        self._pendentes: Dict[Tuple[str, int, str], bytes] = {}
+        versao = self._con.execute("PRAGMA user_version").fetchone()[0]
+        if versao != VERSAO_CACHE_PAGINAS:
+            self._con.executescript(
+                "DROP TABLE IF EXISTS documentos; DROP TABLE IF EXISTS paginas;"
+                f"PRAGMA user_version = {VERSAO_CACHE_PAGINAS};"
+            )
+        self._con.executescript(_SCHEMA)
+        self._con.commit()
+
+    def __enter__(self) -> "CachePaginas":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _desativar(self, e: Exception) -> None:
+        print(f"Cache de páginas desativado ({self.path}): {e}")
+        self._pendentes.clear()
+        self.close()
+
+    def close(self) -> None:
+        self.salvar()
+        if self._con is not None:
+            try:
+                self._con.close()
+            except sqlite3.Error:
+                pass
+            self._con = None
+
+    def documento(self, pdf_path: str) -> Optional[str]:
+        """Hash do conteúdo do PDF, reaproveitado enquanto caminho, tamanho e mtime não mudarem."""
+        if self._con is None:
+            return None
+        try:
+            st = os.stat(pdf_path)
+            caminho = os.path.abspath(pdf_path)
+            linha = self._con.execute(
+                "SELECT hash FROM documentos WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (caminho, st.st_size, st.st_mtime_ns),
+            ).fetchone()
+            if linha:
+                return linha[0]
+            digest = hash_arquivo(pdf_path)
+            self._con.execute(
+                "INSERT OR REPLACE INTO documentos (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                (caminho, st.st_size, st.st_mtime_ns, digest),
+            )
+            self._con.commit()
+            return digest
+        except (OSError, sqlite3.Error) as e:
+            self._desativar(e)
+            return None
+
+    def obter(self, documento: Optional[str], pagina: int, tipo: str) -> Optional[bytes]:
+        if self._con is None or documento is None:
+            return None
+        pendente = self._pendentes.get((documento, pagina, tipo))
+        if pendente is not None:
+            return zlib.decompress(pendente)
+        try:
+            linha = self._con.execute(
+                "SELECT dados FROM paginas WHERE hash = ? AND pagina = ? AND tipo = ?",
+                (documento, pagina, tipo),
+            ).fetchone()
+            if linha is None:
+                return None
+            return zlib.decompress(linha[0])
+        except (sqlite3.Error, zlib.error) as e:
+            self._desativar(e)
+            return None
+
+    def gravar(self, documento: Optional[str], pagina: int, tipo: str, dados: bytes) -> None:
+        """Guarda o conteúdo da página; vai para o disco em lotes (e em `salvar`/`close`)."""
+        if self._con is None or documento is None:
+            return
+        self._pendentes[(documento, pagina, tipo)] = zlib.compress(dados, 1)
+        if len(self._pendentes) >= LOTE_GRAVACAO:
+            self.salvar()
+
+    def salvar(self) -> None:
+        """Grava as páginas pendentes em uma transação curta."""
+        if self._con is None or not self._pendentes:
+            return
+        linhas = [(doc, pagina, tipo, dados) for (doc, pagina, tipo), dados in self._pendentes.items()]
+        self._pendentes.clear()
+        try:
+            with self._con:
+                self._con.executemany(
+                    "INSERT OR REPLACE INTO paginas (hash, pagina, tipo, dados) VALUES (?, ?, ?, ?)",
+                    linhas,
+                )
+        except sqlite3.Error as e:
+            self._desativar(e)
+
+    def obter_ou_calcular(
+        self,
+        documento: Optional[str],
+        pagina: int,
+        tipo: str,
+        calcular: Callable[[], T],
+        codificar: Callable[[T], Optional[bytes]],
+        decodificar: Callable[[bytes], T],
+    ) -> T:
+        """Conteúdo da página vindo do cache ou, na falta dele, de `calcular`.
+
+        `codificar` pode devolver None para um valor que não deve ser guardado.
+        """
+        dados = self.obter(documento, pagina, tipo)
+        if dados is not None:
+            return decodificar(dados)
+        valor = calcular()
+        if self._con is not None and documento is not None:
+            codificado = codificar(valor)
+            if codificado is not None:
+                self.gravar(documento, pagina, tipo, codificado)
+        return valor
+
+
+def abrir_cache_paginas(cache_dir: Optional[str]) -> Optional[CachePaginas]:
+    """CachePaginas em cache_dir, ou None sem cache_dir ou se o banco não puder ser aberto."""
+    if not cache_dir:
+        return None
+    try:
+        return CachePaginas(cache_dir)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Cache de páginas indisponível em '{cache_dir}': {e}")
+        return None
@@ -0,0 +1,43 @@
+"""
+Tokenizador do layout de pagamentos, equivalente a
+``re.findall(REGEX_PAGAMENTOS, texto)`` mas em tempo linear.
+
+Na regex, o nome é uma classe gulosa que também aceita espaços, seguida de
+``\\s+``. Como dígitos não pertencem à classe, um registro só pode existir
+quando o valor começa logo no fim de uma sequência máxima de caracteres de
+nome (letras/espaços) e o último caractere dessa sequência é um espaço. Quando
+não há valor ali, o `re` testa de novo cada início e cada ponto de corte da
+sequência, o que é quadrático em páginas com muito texto e pouco valor (OCR,
+por exemplo). Aqui cada sequência é examinada uma única vez.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterator, List, Tuple
+
+from constants.regex import CLASSE_NOME_PAGAMENTOS, VALOR_PAGAMENTOS
+
+_SEQUENCIA_NOME = re.compile(f"[{CLASSE_NOME_PAGAMENTOS}]+")
+_VALOR = re.compile(VALOR_PAGAMENTOS)
+
+
+def iterar_pagamentos(texto: str) -> Iterator[Tuple[str, str]]:
+    """Gera (nome, valor) como os grupos de REGEX_PAGAMENTOS, na mesma ordem."""
+    fim_anterior = 0
+    for seq in _SEQUENCIA_NOME.finditer(texto):
+        # O `re` retoma a busca no fim do match anterior, que pode cair no
+        # meio de uma sequência (o espaço final do valor pertence à classe).
+        inicio = max(seq.start(), fim_anterior)
+        fim = seq.end()
+        # Nome com pelo menos um caractere e \s+ com pelo menos um espaço
+        if fim - inicio < 2 or not texto[fim - 1].isspace():
+            continue
+        valor = _VALOR.match(texto, fim)
+        if valor is None:
+            continue
+        fim_anterior = valor.end()
+        yield texto[inicio:fim - 1], valor.group()
+
+
+def tokenizar_pagamentos(texto: str) -> List[Tuple[str, str]]:
+    return list(iterar_pagamentos(texto))
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import re
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 import pymupdf as fitz  # type: ignore
 from PyPDF2 import PdfReader
 
 from constants.regex import REGEX_PAGAMENTOS, REGEX_PROJETOS
+from services.page_cache import TIPO_TEXTO, CachePaginas, codificar_texto, decodificar_texto
+from services.payments_tokenizer import tokenizar_pagamentos
 from utils.formatting import formatar_moeda
 
 
@@ -14,14 +16,34 @@ def extrair_pagos(
     pdf_path: str,
     regex: str = REGEX_PAGAMENTOS,
     progress_cb: Optional[Callable[[int], None]] = None,
+    cache: Optional[CachePaginas] = None,
 ) -> Dict[str, str]:
+    """Extrai {nome: valor} do PDF de pagamentos.
+
+    Com `cache`, o texto de cada página vem do cache de páginas quando já foi
+    extraído antes (e é guardado nele quando não foi).
+    """
+    # O layout padrão usa o tokenizador linear; regex customizada vai pelo `re`
+    if regex == REGEX_PAGAMENTOS:
+        buscar = tokenizar_pagamentos
+    else:
+        padrao = re.compile(regex)
+        buscar = padrao.findall
     dados: Dict[str, str] = {}
     try:
+        documento = cache.documento(pdf_path) if cache else None
         with fitz.open(pdf_path) as pdf:
             total_pages = max(1, len(pdf))
-            for page_num, page in enumerate(pdf, start=1):
-                texto = page.get_text("text")
-                for nome, valor in re.findall(regex, texto):
+            for page_num in range(1, len(pdf) + 1):
+                if cache:
+                    texto = cache.obter_ou_calcular(
+                        documento, page_num, TIPO_TEXTO,
+                        lambda: pdf[page_num - 1].get_text("text"),
+                        codificar_texto, decodificar_texto,
+                    )
+                else:
+                    texto = pdf[page_num - 1].get_text("text")
+                for nome, valor in buscar(texto):
                     nome = nome.strip()
                     try:
                         valor_float = float(valor.replace('.', '').replace(',', '.'))
@@ -30,12 +52,61 @@ def extrair_pagos(
                         pass
                 if progress_cb:
                     progress_cb(int(100 * page_num / total_pages))
+        if cache:
+            cache.salvar()
     except Exception as e:
         print(f"Erro ao abrir/processar PDF (Pagos): {e}")
         return {}
     return dados
 
 
+# Caracteres do fim de uma página mantidos para a próxima, para não perder
+# registros que cruzam a quebra de página.
+JANELA_CARRY = 1024
+
+
+def iterar_matches(paginas: Iterable[str], regex: str, janela: int = JANELA_CARRY) -> Iterator[tuple]:
+    """Equivale a re.findall sobre o texto concatenado, mas página a página.
+
+    Um match só é liberado quando há pelo menos `janela` caracteres depois dele
+    no buffer; o trecho ainda incerto segue para a próxima página.
+    """
+    padrao = re.compile(regex)
+    buffer = ""
+    for texto in paginas:
+        buffer += texto
+        limite = len(buffer) - janela
+        corte = max(0, limite)
+        for m in padrao.finditer(buffer):
+            if m.end() > limite:
+                corte = m.start()
+                break
+            yield m.groups()
+            corte = max(m.end(), limite)
+        buffer = buffer[corte:]
+    for m in padrao.finditer(buffer):
+        yield m.groups()
+
+
+def iterar_projeto(
+    pdf_path: str,
+    regex: str = REGEX_PROJETOS,
+    progress_cb: Optional[Callable[[int], None]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Gera (nome, valor bruto) do PDF de projeto conforme as páginas são lidas."""
+    reader = PdfReader(pdf_path)
+    total_pages = max(1, len(reader.pages))
+
+    def paginas() -> Iterator[str]:
+        for page_num, page in enumerate(reader.pages, start=1):
+            yield page.extract_text() or ""
+            if progress_cb:
+                progress_cb(int(100 * page_num / total_pages))
+
+    for name, value in iterar_matches(paginas(), regex):
+        yield name.strip(), value
+
+
 def extrair_projeto(
     pdf_path: str,
     regex: str = REGEX_PROJETOS,
@@ -43,15 +114,7 @@ def extrair_projeto(
 ) -> Dict[str, str]:
     extracted: Dict[str, str] = {}
     try:
-        reader = PdfReader(pdf_path)
-        total_pages = max(1, len(reader.pages))
-        all_text = ""
-        for page_num, page in enumerate(reader.pages, start=1):
-            all_text += (page.extract_text() or "")
-            if progress_cb:
-                progress_cb(int(100 * page_num / total_pages))
-        for name, value in re.findall(regex, all_text):
-            name = name.strip()
+        for name, value in iterar_projeto(pdf_path, regex, progress_cb):
             try:
                 valor_float = float(value.replace('.', '').replace(',', '.'))
                 extracted[name] = formatar_moeda(valor_float)
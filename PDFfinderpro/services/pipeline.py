@@ -0,0 +1,222 @@
+"""
+Pipeline por PDF de projeto, sem dependência de Qt.
+
+Cada PDF de projeto passa por três etapas (extração do projeto, comparação
+exata/por prefixo com os pagamentos e destaque no PDF de pagamentos). Os PDFs são independentes entre si, então podem ser
+processados em série ou em um pool de processos.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Manager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from constants.filenames import (
+    FN_DADOS_PAGOS,
+    FN_DADOS_PROJETO,
+    FN_FUNC_ENCONTRADOS,
+    FN_FUNC_NOMES_DIF,
+    FN_NOMES_NAO_DEST,
+    FN_NOMES_NAO_ENC,
+)
+from constants.regex import REGEX_PROJETOS
+from services.annotate import anotar_pdf_nomes
+from services.artifacts import ArtefatosPdf
+from services.compare import comparar_registros, linhas_de_registros, registros_de_dados
+from services.pdf_extraction import extrair_projeto
+from services.totals import gravar_relatorio
+
+ETAPAS_POR_PDF = 3
+
+# (índice do PDF, etapa 1..ETAPAS_POR_PDF, percentual da etapa)
+ProgressoPdf = Callable[[int, int, int], None]
+# (nome do PDF, mensagem de erro)
+ErroPdf = Callable[[str, str], None]
+
+
+def criar_pasta_saida_por_pdf(pdf_path: str, base_output_dir: str) -> Optional[str]:
+    try:
+        nome_arquivo = Path(pdf_path).name
+        nome_pasta = nome_arquivo.split(' - ')[0].strip()
+        pasta_saida = Path(base_output_dir, nome_pasta)
+        os.makedirs(pasta_saida, exist_ok=True)
+        return str(pasta_saida)
+    except Exception as e:
+        print(f"Erro ao criar pasta de saída: {e}")
+        return None
+
+
+def processar_pdf_projeto(
+    pdf_todos: str,
+    pdf_pagos_path: str,
+    dados_pagos: Dict[str, str],
+    pasta_saida: str,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    pasta_exportacao: Optional[str] = None,
+    pasta_cache: Optional[str] = None,
+) -> None:
+    """Executa as etapas de um PDF de projeto gravando os artefatos em pasta_saida.
+
+    Os dados passam de uma etapa para a outra em memória; cada txt é gravado
+    uma única vez, já com o conteúdo final e o cabeçalho de totais.
+    progress_cb recebe (etapa, percentual), com etapa de 1 a ETAPAS_POR_PDF.
+    Com pasta_exportacao, os artefatos também são replicados em
+    pasta_exportacao/<nome da pasta_saida>. pasta_cache é a pasta do cache
+    de páginas usado no destaque do PDF de pagamentos.
+    """
+    def prog(etapa: int) -> Callable[[int], None]:
+        def _cb(pct: int) -> None:
+            if progress_cb:
+                progress_cb(etapa, pct)
+        return _cb
+
+    artefatos = ArtefatosPdf(pasta_saida)
+    output_pagos = artefatos.caminho(FN_DADOS_PAGOS)
+    output_projeto = artefatos.caminho(FN_DADOS_PROJETO)
+    arquivo_saida_exato = artefatos.caminho(FN_FUNC_ENCONTRADOS)
+    arquivo_saida_diferente = artefatos.caminho(FN_FUNC_NOMES_DIF)
+    output_pdf = artefatos.caminho(f"{Path(pdf_todos).stem}_destacado.pdf")
+    arquivo_nomes_nao_encontrados = artefatos.caminho(FN_NOMES_NAO_ENC)
+    artefatos.caminho(FN_NOMES_NAO_DEST)  # gravado por anotar_pdf_nomes, se houver
+
+    # Dados de pagamentos (extraídos uma vez por execução)
+    if dados_pagos:
+        gravar_relatorio(output_pagos, (f"{nome}: {valor}\n" for nome, valor in sorted(dados_pagos.items())))
+    pagos = dict(registros_de_dados(dados_pagos))
+
+    # 1) Extrair dados do projeto
+    prog(1)(0)
+    dados_proj = extrair_projeto(pdf_todos, REGEX_PROJETOS, prog(1))
+    if dados_proj:
+        gravar_relatorio(output_projeto, (f"{nome}: {valor}\n" for nome, valor in sorted(dados_proj.items())))
+    registros_proj = registros_de_dados(dados_proj)
+
+    # 2) Comparação exata e, para o restante, por prefixo único de mesmo valor.
+    # Os nomes achados por prefixo entram na lista de encontrados logo após
+    # os exatos.
+    prog(2)(0)
+    exatos, diferentes, nao_encontrados, encontrados_como = comparar_registros(pagos, registros_proj, prog(2))
+    encontrados = exatos + encontrados_como
+    gravar_relatorio(arquivo_saida_exato, linhas_de_registros(encontrados))
+    gravar_relatorio(arquivo_saida_diferente, diferentes)
+    gravar_relatorio(arquivo_nomes_nao_encontrados, linhas_de_registros(nao_encontrados), totais=False)
+
+    # 3) Anotar PDF
+    prog(3)(0)
+    anotar_pdf_nomes(
+        pdf_pagos_path, [nome for nome, _ in encontrados], output_pdf, prog(3),
+        totais=True, cache_dir=pasta_cache,
+    )
+
+    # Os artefatos já estão em pasta_saida; só a exportação copia (ou liga) arquivos
+    if pasta_exportacao:
+        artefatos.exportar(str(Path(pasta_exportacao, Path(pasta_saida).name)))
+
+    print(f"Processamento concluído para: {Path(pdf_todos).name}")
+
+
+def _inicializar_processo() -> None:
+    """Inicializador do pool: mensagens dos serviços vão para stderr.
+
+    No modo spawn (o único no Windows) o processo filho não herda um
+    sys.stdout redirecionado pelo chamador; stdout fica reservado para a
+    saída de quem chamou (o resumo JSON da linha de comando).
+    """
+    sys.stdout = sys.stderr
+
+
+def _processar_grupo(
+    tarefas: List[Tuple[int, str, str]],
+    pdf_pagos_path: str,
+    dados_pagos: Dict[str, str],
+    fila_progresso,
+    pasta_exportacao: Optional[str] = None,
+    pasta_cache: Optional[str] = None,
+) -> List[Tuple[int, Optional[str]]]:
+    """Executa, em um processo do pool, os PDFs que compartilham a mesma pasta de saída.
+
+    Retorna (índice, erro) por PDF; erro é None quando o PDF foi concluído.
+    """
+    resultados: List[Tuple[int, Optional[str]]] = []
+    for idx, pdf_todos, pasta_saida in tarefas:
+        ultimo = [(-1, -1)]
+
+        def _cb(etapa: int, pct: int, idx: int = idx, ultimo=ultimo) -> None:
+            # Evita inundar a fila: só envia quando o percentual muda
+            if (etapa, pct) != ultimo[0]:
+                ultimo[0] = (etapa, pct)
+                fila_progresso.put((idx, etapa, pct))
+
+        try:
+            processar_pdf_projeto(
+                pdf_todos, pdf_pagos_path, dados_pagos, pasta_saida, _cb, pasta_exportacao, pasta_cache
+            )
+            resultados.append((idx, None))
+        except Exception as e:
+            resultados.append((idx, f"{type(e).__name__}: {e}"))
+        fila_progresso.put((idx, ETAPAS_POR_PDF, 100))
+    return resultados
+
+
+def processar_em_paralelo(
+    tarefas: List[Tuple[int, str, str]],
+    pdf_pagos_path: str,
+    dados_pagos: Dict[str, str],
+    max_workers: int,
+    progress_cb: Optional[ProgressoPdf] = None,
+    erro_cb: Optional[ErroPdf] = None,
+    pasta_exportacao: Optional[str] = None,
+    pasta_cache: Optional[str] = None,
+) -> List[int]:
+    """Processa (índice, pdf, pasta_saida) em um ProcessPoolExecutor.
+
+    PDFs que apontam para a mesma pasta de saída são agrupados e executados em
+    sequência no mesmo processo, preservando a ordem (e os arquivos finais) do
+    modo serial. Falhas de um PDF são repassadas a erro_cb sem interromper o
+    lote. Retorna os índices concluídos com sucesso.
+    """
+    grupos: Dict[str, List[Tuple[int, str, str]]] = {}
+    for tarefa in tarefas:
+        grupos.setdefault(os.path.normcase(os.path.abspath(tarefa[2])), []).append(tarefa)
+    nomes = {idx: Path(pdf).name for idx, pdf, _ in tarefas}
+
+    concluidos: List[int] = []
+    with Manager() as manager:
+        fila = manager.Queue()
+
+        def _drenar() -> None:
+            while True:
+                try:
+                    idx, etapa, pct = fila.get_nowait()
+                except queue.Empty:
+                    return
+                if progress_cb:
+                    progress_cb(idx, etapa, pct)
+
+        with ProcessPoolExecutor(max_workers=max(1, max_workers), initializer=_inicializar_processo) as executor:
+            pendentes = {
+                executor.submit(
+                    _processar_grupo, grupo, pdf_pagos_path, dados_pagos, fila, pasta_exportacao, pasta_cache
+                ): grupo
+                for grupo in grupos.values()
+            }
+            while pendentes:
+                prontos, _ = wait(pendentes, timeout=0.2, return_when=FIRST_COMPLETED)
+                _drenar()
+                for futuro in prontos:
+                    grupo = pendentes.pop(futuro)
+                    try:
+                        resultados = futuro.result()
+                    except Exception as e:
+                        resultados = [(idx, f"{type(e).__name__}: {e}") for idx, _, _ in grupo]
+                    for idx, erro in resultados:
+                        if erro is None:
+                            concluidos.append(idx)
+                        elif erro_cb:
+                            erro_cb(nomes[idx], erro)
+        _drenar()
+    return sorted(concluidos)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IndicePrefixos:
+    """Chaves ordenadas para consultas por prefixo com busca binária.
+
+    Todas as chaves que começam com um prefixo ficam em um intervalo contíguo
+    da lista ordenada; `unico` decide "exatamente uma" ou "ambíguo/nenhuma"
+    olhando só as duas primeiras posições desse intervalo (O(log n)).
+    """
+
+    def __init__(self, chaves: Iterable[str]) -> None:
+        self._chaves: List[str] = sorted(set(chaves))
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def _intervalo(self, prefixo: str) -> Tuple[int, int]:
+        chaves = self._chaves
+        lo = bisect_left(chaves, prefixo)
+        # Truncar as chaves ao tamanho do prefixo preserva a ordenação, então o
+        # fim do intervalo também sai de uma busca binária.
+        n = len(prefixo)
+        a, b = lo, len(chaves)
+        while a < b:
+            meio = (a + b) // 2
+            if chaves[meio][:n] <= prefixo:
+                a = meio + 1
+            else:
+                b = meio
+        return lo, a
+
+    def buscar(self, prefixo: str) -> List[str]:
+        lo, hi = self._intervalo(prefixo)
+        return self._chaves[lo:hi]
+
+    def contar(self, prefixo: str) -> int:
+        lo, hi = self._intervalo(prefixo)
+        return hi - lo
+
+    def unico(self, prefixo: str) -> Optional[str]:
+        """Retorna a chave se exatamente uma começa com `prefixo`; senão None."""
+        chaves = self._chaves
+        lo = bisect_left(chaves, prefixo)
+        if lo >= len(chaves) or not chaves[lo].startswith(prefixo):
+            return None
+        if lo + 1 < len(chaves) and chaves[lo + 1].startswith(prefixo):
+            return None
+        return chaves[lo]
+
+
+class IndicePrefixosPorValor:
+    """Um IndicePrefixos por valor, para prefixos que também exigem valor igual."""
+
+    def __init__(self, dados: Dict[str, str]) -> None:
+        grupos: Dict[str, List[str]] = {}
+        for nome, valor in dados.items():
+            grupos.setdefault(valor, []).append(nome)
+        self._indices = {valor: IndicePrefixos(nomes) for valor, nomes in grupos.items()}
+
+    def unico(self, prefixo: str, valor: str) -> Optional[str]:
+        indice = self._indices.get(valor)
+        return indice.unico(prefixo) if indice else None
+
+    def buscar(self, prefixo: str, valor: str) -> List[str]:
+        indice = self._indices.get(valor)
+        return indice.buscar(prefixo) if indice else []
@@ -1,34 +1,155 @@
 from __future__ import annotations
 
+import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from utils.formatting import formatar_moeda
 
+_LINHA_VALOR = re.compile(r".+?:\s*([\d,.]+)")
+
+# Acima disso o corpo de um RelatorioTxt sai da memória para um arquivo temporário
+LIMITE_MEMORIA_RELATORIO = 8 * 1024 * 1024
+
+
+def valor_da_linha(line: str) -> Tuple[bool, float]:
+    """(conta como nome, valor) de uma linha, pela regra dos totais dos txt."""
+    if line.startswith("Total:"):
+        return False, 0.0
+    m = _LINHA_VALOR.match(line)
+    if not m:
+        return False, 0.0
+    try:
+        return True, float(m.group(1).replace('.', '').replace(',', '.'))
+    except ValueError:
+        return True, 0.0
+
 
 def calcular_totais_de_linhas(linhas: Iterable[str]) -> Tuple[int, float]:
     total_valor = 0.0
     total_nomes = 0
     for line in linhas:
-        if not line.startswith("Total:"):
-            m = re.match(r".+?:\s*([\d,.]+)", line)
-            if m:
-                try:
-                    valor = float(m.group(1).replace('.', '').replace(',', '.'))
-                    total_valor += valor
-                    total_nomes += 1
-                except ValueError:
-                    total_nomes += 1
+        conta, valor = valor_da_linha(line)
+        if conta:
+            total_nomes += 1
+            total_valor += valor
     return total_nomes, total_valor
 
 
+def linha_total(total_nomes: int, total_valor: float) -> str:
+    return f"Total: {total_nomes} nomes, Valor: {formatar_moeda(total_valor)}\n"
+
+
+def _linhas_fisicas(texto: str) -> Iterator[str]:
+    """Linhas de `texto` como seriam relidas do arquivo (quebras universais)."""
+    texto = texto.replace("\r\n", "\n").replace("\r", "\n")
+    inicio = 0
+    while inicio < len(texto):
+        fim = texto.find("\n", inicio)
+        if fim < 0:
+            yield texto[inicio:]
+            return
+        yield texto[inicio:fim + 1]
+        inicio = fim + 1
+
+
+class RelatorioTxt:
+    """Grava um txt de relatório somando nomes e valores enquanto as linhas são escritas.
+
+    O arquivo final (cabeçalho "Total:" + linhas) só aparece no fechamento,
+    por meio de um temporário na mesma pasta e os.replace; o resultado é o
+    mesmo de gravar as linhas e depois chamar atualizar_totais_txt, sem reler
+    nem reinterpretar o arquivo. Com totais=False, apenas grava as linhas.
+    """
+
+    def __init__(self, path: str, totais: bool = True) -> None:
+        self.path = path
+        self.totais = totais
+        self.total_nomes = 0
+        self.total_valor = 0.0
+        self._primeira = True
+        self._pendente = ""
+        self._corpo = tempfile.SpooledTemporaryFile(
+            max_size=LIMITE_MEMORIA_RELATORIO, mode="w+", encoding="utf-8", newline=""
+        )
+
+    def __enter__(self) -> "RelatorioTxt":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.fechar()
+        else:
+            self._corpo.close()
+
+    def escrever(self, texto: str) -> None:
+        # Linha ainda incompleta (ou um \r que pode fazer par com o \n da
+        # próxima escrita) fica pendente até terminar
+        texto = self._pendente + texto
+        fim = max(texto.rfind("\n"), texto.rfind("\r", 0, len(texto) - 1))
+        self._pendente = texto[fim + 1:]
+        for linha in _linhas_fisicas(texto[:fim + 1]):
+            self._escrever_linha(linha)
+
+    def escrever_linhas(self, linhas: Iterable[str]) -> None:
+        for linha in linhas:
+            self.escrever(linha)
+
+    def _escrever_linha(self, linha: str) -> None:
+        if self.totais:
+            if self._primeira and linha.startswith("Total:"):
+                # Como em atualizar_totais_txt: a primeira linha "Total:" é o cabeçalho
+                self._primeira = False
+                return
+            conta, valor = valor_da_linha(linha)
+            if conta:
+                self.total_nomes += 1
+                self.total_valor += valor
+        self._primeira = False
+        self._corpo.write(linha)
+
+    def fechar(self) -> None:
+        if self._pendente:
+            self._escrever_linha(self._pendente)
+            self._pendente = ""
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                if self.totais:
+                    f.write(linha_total(self.total_nomes, self.total_valor))
+                self._corpo.seek(0)
+                shutil.copyfileobj(self._corpo, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        finally:
+            self._corpo.close()
+
+
+def gravar_relatorio(path: str, linhas: Iterable[str], totais: bool = True) -> Optional[str]:
+    """Grava `linhas` em `path` com o cabeçalho de totais. Retorna o caminho, ou None em caso de erro."""
+    try:
+        with RelatorioTxt(path, totais) as relatorio:
+            relatorio.escrever_linhas(linhas)
+        return path
+    except Exception as e:
+        print(f"Erro ao gravar '{path}': {e}")
+        return None
+
+
 def atualizar_totais_txt(arquivo_path: str) -> None:
     try:
         with open(arquivo_path, 'r+', encoding='utf-8') as f:
             lines = f.readlines()
             total_nomes, total_valor = calcular_totais_de_linhas(lines)
-            new_total_line = f"Total: {total_nomes} nomes, Valor: {formatar_moeda(total_valor)}\n"
+            new_total_line = linha_total(total_nomes, total_valor)
             if lines and lines[0].startswith("Total:"):
                 lines[0] = new_total_line
             else:
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+# Separador entre nomes do mesmo valor; não aparece em nomes nem em trechos
+# vindos de str.split(), então um trecho nunca "atravessa" dois nomes.
+_SEP = "\x00"
+
+
+class IndicePorValor:
+    """Índice nome/valor para buscas de trecho restritas a um único valor.
+
+    Os nomes de `dados` (nome -> valor) são agrupados por valor uma única vez;
+    cada grupo vira um texto só, e a pergunta "existe nome com este valor que
+    contém este trecho?" vira uma única busca de substring nesse texto, em vez
+    de percorrer todos os nomes do arquivo.
+    """
+
+    def __init__(self, dados: Dict[str, str]) -> None:
+        grupos: Dict[str, List[str]] = {}
+        for nome, valor in dados.items():
+            grupos.setdefault(valor, []).append(nome)
+        self._grupos = grupos
+        self._textos = {valor: _SEP.join(nomes) for valor, nomes in grupos.items()}
+
+    def nomes(self, valor: str) -> List[str]:
+        return list(self._grupos.get(valor, []))
+
+    def contem(self, trecho: str, valor: str) -> bool:
+        """True se algum nome com exatamente este valor contém `trecho`."""
+        texto = self._textos.get(valor)
+        if texto is None or _SEP in trecho:
+            return False
+        return trecho in texto
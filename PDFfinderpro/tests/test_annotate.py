@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+import pymupdf as fitz  # noqa: E402
+
+from services.annotate import anotar_pdf, caracteres_pagina, localizar_nomes  # noqa: E402
+from services.name_matcher import AutomatoNomes, normalizar  # noqa: E402
+
+
+def _destaques(path):
+    with fitz.open(path) as pdf:
+        return [sorted(tuple(round(x, 1) for x in a.rect) for a in page.annots()) for page in pdf]
+
+
+class TestNameMatcher(unittest.TestCase):
+    def test_normalizar(self):
+        self.assertEqual(normalizar("  Joao   DA\tSilva "), "joao da silva")
+        self.assertEqual(normalizar("ÇÃO"), "ÇÃo")  # só ASCII, como no MuPDF
+
+    def test_buscar_sem_sobreposicao(self):
+        automato = AutomatoNomes(["aa", "ana", "juliana"])
+        hits = automato.buscar_sem_sobreposicao("juliana aaaa")
+        self.assertEqual(hits[2], [(0, 7)])
+        self.assertEqual(hits[1], [(4, 7)])
+        self.assertEqual(hits[0], [(8, 10), (10, 12)])
+
+
+class TestAnotarPdf(unittest.TestCase):
+    def test_mesmo_resultado_que_search_for(self):
+        linhas = [
+            "JULIANA SOUZA   1.234,56 ",
+            "joao da silva   10,00 ",
+            "PEDRO",
+            "ALVES 20,00",
+            "MARIA  JOSE, 30,00",
+        ]
+        nomes = ["ANA", "JOAO DA SILVA", "PEDRO ALVES", "MARIA JOSE", "NINGUEM", "ana souza"]
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "pagos.pdf")
+            doc = fitz.open()
+            for _ in range(2):
+                page = doc.new_page()
+                for i, linha in enumerate(linhas):
+                    page.insert_text((72, 72 + 20 * i), linha)
+            doc.save(pdf_path)
+
+            txt_path = os.path.join(tmp, "encontrados.txt")
+            with open(txt_path, "w", encoding="utf-8") as f:
+                for nome in nomes:
+                    f.write(f"{nome}: 1,00\n")
+
+            # Referência: uma busca search_for por nome e por página
+            esperado_pdf = os.path.join(tmp, "esperado.pdf")
+            with fitz.open(pdf_path) as pdf:
+                for page in pdf:
+                    for nome in nomes:
+                        for area in page.search_for(nome):
+                            page.add_highlight_annot(area)
+                pdf.save(esperado_pdf)
+
+            saida = os.path.join(tmp, "out", "destacado.pdf")
+            os.makedirs(os.path.dirname(saida))
+            nao_dest = anotar_pdf(pdf_path, txt_path, saida)
+
+            self.assertEqual(_destaques(saida), _destaques(esperado_pdf))
+            with open(nao_dest, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read().splitlines(), ["Total de nomes não encontrados: 1", "NINGUEM"])
+
+    def test_espacos_colapsados_iguais_a_search_for(self):
+        # Brancos repetidos no fim da linha, no começo da seguinte e em linhas
+        # só de espaços entram na área destacada, como no search_for
+        linhas = [
+            "JOAO   DA    SILVA   10,00",
+            "PEDRO    ",
+            "ALVES   20,00",
+            "MARIA JOSE     ",
+            "   SOUZA",
+            "ANA  ",
+            "  ",
+            "LIMA",
+        ]
+        nomes = ["JOAO DA SILVA", "PEDRO ALVES", "MARIA JOSE SOUZA", "JOSE SOUZA", "ANA LIMA"]
+        doc = fitz.open()
+        page = doc.new_page()
+        for i, linha in enumerate(linhas):
+            page.insert_text((72, 72 + 20 * i), linha)
+        page = doc[0]
+        areas = localizar_nomes(caracteres_pagina(page), AutomatoNomes([normalizar(n) for n in nomes]))
+        for pid, nome in enumerate(nomes):
+            with self.subTest(nome=nome):
+                esperado = page.search_for(nome)
+                self.assertTrue(esperado)
+                self.assertEqual([tuple(r) for r in areas[pid]], [tuple(r) for r in esperado])
+        doc.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
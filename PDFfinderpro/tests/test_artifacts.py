@@ -0,0 +1,78 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.artifacts import ArtefatosPdf, publicar_arquivo, salvar_arquivos_na_pasta  # noqa: E402
+
+
+def _escrever(path, texto):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(texto)
+
+
+def _ler(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestArtefatos(unittest.TestCase):
+    def test_mesmo_arquivo_nao_e_copiado(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.txt")
+            _escrever(path, "conteudo")
+            with mock.patch("shutil.copy2") as copy2, mock.patch("os.link") as link:
+                self.assertFalse(publicar_arquivo(path, path))
+                self.assertEqual(salvar_arquivos_na_pasta(tmp, *([path] * 6), None, path), tmp)
+            copy2.assert_not_called()
+            link.assert_not_called()
+            self.assertEqual(_ler(path), "conteudo")
+
+    def test_publicar_da_pasta_de_trabalho(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trabalho = os.path.join(tmp, "trabalho")
+            saida = os.path.join(tmp, "saida")
+            os.makedirs(trabalho)
+            os.makedirs(saida)
+            _escrever(os.path.join(saida, "antigo.txt"), "de outra execução")
+            _escrever(os.path.join(saida, "a.txt"), "velho")
+
+            artefatos = ArtefatosPdf(saida, pasta_trabalho=trabalho)
+            _escrever(artefatos.caminho("a.txt"), "novo")
+            artefatos.caminho("antigo.txt")  # registrado, mas não gerado desta vez
+
+            self.assertEqual(artefatos.publicar(), [os.path.join(saida, "a.txt")])
+            self.assertEqual(os.listdir(saida), ["a.txt"])
+            self.assertEqual(_ler(os.path.join(saida, "a.txt")), "novo")
+            self.assertEqual(os.listdir(trabalho), [])
+
+    def test_exportar_com_link_ou_copia(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            saida = os.path.join(tmp, "saida")
+            os.makedirs(saida)
+            artefatos = ArtefatosPdf(saida)
+            _escrever(artefatos.caminho("a.txt"), "a")
+            self.assertEqual(artefatos.publicar(), [])
+
+            destino = os.path.join(tmp, "export", "001")
+            artefatos.exportar(destino)
+            self.assertTrue(os.path.samefile(os.path.join(saida, "a.txt"), os.path.join(destino, "a.txt")))
+            # Reexportar o mesmo arquivo não faz nada
+            self.assertEqual(artefatos.exportar(destino), [])
+
+            # Sem hardlink (outra unidade), cai na cópia
+            outro = os.path.join(tmp, "export2")
+            with mock.patch("os.link", side_effect=OSError("EXDEV")):
+                artefatos.exportar(outro)
+            self.assertEqual(_ler(os.path.join(outro, "a.txt")), "a")
+            self.assertFalse(os.path.samefile(os.path.join(saida, "a.txt"), os.path.join(outro, "a.txt")))
+            self.assertEqual(sorted(os.listdir(outro)), ["a.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+import pymupdf as fitz  # noqa: E402
+
+
+def _pdf(path, linhas):
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, linha in enumerate(linhas):
+        page.insert_text((50, 60 + i * 16), linha, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def _executar(*args):
+    return subprocess.run(
+        [sys.executable, os.path.join(PROJECT_DIR, "app.py"), *args],
+        capture_output=True, text=True, cwd=PROJECT_DIR,
+    )
+
+
+class TestCli(unittest.TestCase):
+    def test_lote_sem_interface(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pagos = os.path.join(tmpdir, "pagos.pdf")
+            _pdf(pagos, ["JOAO DA SILVA 1.234,56 ", "MARIA SOUZA 500,00 "])
+            projetos = os.path.join(tmpdir, "projetos")
+            os.makedirs(projetos)
+            _pdf(os.path.join(projetos, "001 - projeto.pdf"), ["001 - JOAO DA SILVA 123.456.789-10 ANALISTA 1.234,56"])
+            saida = os.path.join(tmpdir, "saida")
+            os.makedirs(saida)
+
+            proc = _executar(pagos, projetos, saida)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            resumo = json.loads(proc.stdout)
+            self.assertEqual(resumo["status"], "ok")
+            self.assertEqual(resumo["concluidos"], ["001 - projeto.pdf"])
+            self.assertEqual(resumo["registros_pagos"], 2)
+            self.assertIn("Progresso: 100%", proc.stderr)
+            self.assertTrue(os.path.exists(os.path.join(saida, "001", "001 - projeto_destacado.pdf")))
+
+            exportacao = os.path.join(tmpdir, "exportacao")
+            proc = _executar(pagos, projetos, saida, "--exportar", exportacao)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertEqual(json.loads(proc.stdout)["pasta_exportacao"], exportacao)
+            self.assertEqual(sorted(os.listdir(os.path.join(exportacao, "001"))), sorted(os.listdir(os.path.join(saida, "001"))))
+
+    def test_paralelo_spawn_stdout_so_json(self):
+        # spawn é o modo do Windows: os processos do pool não herdam o
+        # redirecionamento de sys.stdout feito pelo cli
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pagos = os.path.join(tmpdir, "pagos.pdf")
+            _pdf(pagos, ["JOAO DA SILVA 1.234,56 ", "MARIA SOUZA 500,00 "])
+            projetos = os.path.join(tmpdir, "projetos")
+            os.makedirs(projetos)
+            for nome in ("001 - a.pdf", "002 - b.pdf"):
+                _pdf(os.path.join(projetos, nome), ["001 - JOAO DA SILVA 123.456.789-10 ANALISTA 1.234,56"])
+            saida = os.path.join(tmpdir, "saida")
+            codigo = (
+                "import multiprocessing, sys\n"
+                "multiprocessing.set_start_method('spawn')\n"
+                "import cli\n"
+                "sys.exit(cli.main(sys.argv[1:]))\n"
+            )
+            proc = subprocess.run(
+                [sys.executable, "-c", codigo, pagos, projetos, saida, "--processos", "2"],
+                capture_output=True, text=True, cwd=PROJECT_DIR,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            resumo = json.loads(proc.stdout)
+            self.assertEqual(resumo["concluidos"], ["001 - a.pdf", "002 - b.pdf"])
+            self.assertIn("Processamento concluído para: 001 - a.pdf", proc.stderr)
+
+    def test_sem_pdfs_de_projeto(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pagos = os.path.join(tmpdir, "pagos.pdf")
+            _pdf(pagos, ["JOAO DA SILVA 1.234,56 "])
+            vazia = os.path.join(tmpdir, "vazia")
+            os.makedirs(vazia)
+            resumo_path = os.path.join(tmpdir, "resumo.json")
+            proc = _executar(pagos, vazia, tmpdir, "--resumo", resumo_path)
+            self.assertEqual(proc.returncode, 2)
+            with open(resumo_path, encoding="utf-8") as f:
+                resumo = json.load(f)
+        self.assertEqual(resumo["status"], "erro")
+        self.assertIn("Não foram encontrados arquivos PDF", resumo["erro"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.compare import (  # noqa: E402
+    adicionar_nomes_encontrados,
+    comparar_busca_parcial,
+    comparar_exata_e_parcial,
+    comparar_registros,
+    ler_registros,
+    linhas_de_registros,
+    registros_de_dados,
+)
+from services.value_index import IndicePorValor  # noqa: E402
+
+
+def _busca_parcial_original(dados1, dados2):
+    """Implementação original (varredura completa) usada como referência."""
+    encontrados = []
+    for nome2, valor2 in dados2:
+        partes = nome2.split()
+        for i in range(len(partes), 0, -1):
+            parcial = " ".join(partes[:i])
+            if any(parcial in nome1 and valor1 == valor2 for nome1, valor1 in dados1.items()):
+                encontrados.append(nome2)
+                break
+    return encontrados
+
+
+def _escrever(path, itens):
+    with open(path, "w", encoding="utf-8") as f:
+        for nome, valor in itens:
+            f.write(f"{nome}: {valor}\n")
+
+
+class TestIndicePorValor(unittest.TestCase):
+    def test_contem(self):
+        indice = IndicePorValor({"JOAO DA SILVA": "10,00", "MARIA JOSE": "20,00"})
+        self.assertTrue(indice.contem("SILVA", "10,00"))
+        self.assertFalse(indice.contem("SILVA", "20,00"))
+        self.assertFalse(indice.contem("SILVAMARIA", "10,00"))
+        self.assertFalse(indice.contem("JOAO", "99,99"))
+        self.assertEqual(indice.nomes("20,00"), ["MARIA JOSE"])
+
+    def test_comparar_busca_parcial_igual_ao_original(self):
+        rnd = random.Random(42)
+        palavras = ["ANA", "JOAO", "MARIA", "SILVA", "SOUZA", "JOSE", "LIMA", "PAULA", "DA", "DE"]
+        valores = ["10,00", "20,00", "30,00"]
+
+        def nome():
+            return " ".join(rnd.choice(palavras) for _ in range(rnd.randint(1, 4)))
+
+        dados1 = {nome(): rnd.choice(valores) for _ in range(40)}
+        dados2 = sorted({nome(): rnd.choice(valores) for _ in range(60)}.items())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            a1 = os.path.join(tmp, "a1.txt")
+            a2 = os.path.join(tmp, "a2.txt")
+            out = os.path.join(tmp, "out.txt")
+            _escrever(a1, sorted(dados1.items()))
+            _escrever(a2, dados2)
+            comparar_busca_parcial(a1, a2, out)
+            with open(out, "r", encoding="utf-8") as f:
+                obtidos = [linha.split(":")[0] for linha in f]
+
+        self.assertEqual(obtidos, _busca_parcial_original(dados1, dados2))
+
+
+class TestComparacaoEmMemoria(unittest.TestCase):
+    def test_registros_de_dados_igual_a_reler_o_txt(self):
+        dados = {
+            "JOAO DA SILVA": "10,00",
+            "MARIA\nDE SOUZA": "20,00",
+            "ANA\r\nLIMA": "1.234,56",
+            " ": "5,00",
+            "\n": "6,00",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dados.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                for nome, valor in sorted(dados.items()):
+                    f.write(f"{nome}: {valor}\n")
+            self.assertEqual(registros_de_dados(dados), ler_registros(path))
+
+    def test_comparar_registros_igual_aos_arquivos(self):
+        rnd = random.Random(7)
+        palavras = ["ANA", "JOAO", "MARIA", "SILVA", "SOUZA", "JOSE", "LIMA", "DA"]
+        valores = ["10,00", "20,00", "30,00"]
+
+        def nome():
+            return " ".join(rnd.choice(palavras) for _ in range(rnd.randint(2, 4)))
+
+        pagos = {nome(): rnd.choice(valores) for _ in range(50)}
+        projeto = {nome(): rnd.choice(valores) for _ in range(50)}
+        projeto.update(list(pagos.items())[:10])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            caminhos = {k: os.path.join(tmp, f"{k}.txt") for k in ("pagos", "projeto", "exato", "dif", "nao")}
+            _escrever(caminhos["pagos"], sorted(pagos.items()))
+            _escrever(caminhos["projeto"], sorted(projeto.items()))
+            comparar_exata_e_parcial(
+                caminhos["pagos"], caminhos["projeto"], caminhos["exato"], caminhos["dif"], caminhos["nao"]
+            )
+            adicionar_nomes_encontrados(caminhos["dif"], caminhos["exato"])
+            esperado = {}
+            for k in ("exato", "dif", "nao"):
+                with open(caminhos[k], "r", encoding="utf-8") as f:
+                    esperado[k] = f.readlines()
+
+        exatos, diferentes, nao_encontrados, encontrados_como = comparar_registros(
+            dict(registros_de_dados(pagos)), registros_de_dados(projeto)
+        )
+        self.assertTrue(exatos and encontrados_como and nao_encontrados)
+        self.assertEqual(linhas_de_registros(exatos + encontrados_como), esperado["exato"])
+        self.assertEqual("".join(diferentes).splitlines(keepends=True), esperado["dif"])
+        self.assertEqual(linhas_de_registros(nao_encontrados), esperado["nao"])
+
+
+if __name__ == "__main__":
+    unittest.main()
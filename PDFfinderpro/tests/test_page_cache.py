@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+import pymupdf as fitz  # noqa: E402
+
+from services import annotate  # noqa: E402
+from services.annotate import anotar_pdf_nomes, caracteres_pagina, codificar_fluxo, decodificar_fluxo  # noqa: E402
+from services.extraction_cache import extrair_pagos_cache  # noqa: E402
+from services.page_cache import TIPO_TEXTO, CachePaginas  # noqa: E402
+from services.pdf_extraction import extrair_pagos  # noqa: E402
+
+LINHAS = [
+    "JULIANA SOUZA   1.234,56 ",
+    "JOAO DA SILVA   10,00 ",
+    "MARIA  JOSE   30,00 ",
+]
+
+
+def _pdf(path, linhas, paginas=3):
+    doc = fitz.open()
+    for _ in range(paginas):
+        page = doc.new_page()
+        for i, linha in enumerate(linhas):
+            page.insert_text((72, 72 + 20 * i), linha)
+    doc.save(path)
+    doc.close()
+
+
+def _destaques(path):
+    with fitz.open(path) as pdf:
+        return [sorted(tuple(a.rect) for a in page.annots()) for page in pdf]
+
+
+def _gravar_paginas(cache_dir, documento, paginas, pausa):
+    """Grava páginas como uma extração faria; retorna (maior espera em uma gravação, cache ativo)."""
+    maior = 0.0
+    with CachePaginas(cache_dir) as cache:
+        for pagina in range(1, paginas + 1):
+            time.sleep(pausa)  # tempo de extração da página
+            inicio = time.monotonic()
+            cache.gravar(documento, pagina, TIPO_TEXTO, f"{documento} {pagina}".encode("utf-8"))
+            maior = max(maior, time.monotonic() - inicio)
+        inicio = time.monotonic()
+        cache.salvar()
+        maior = max(maior, time.monotonic() - inicio)
+        return maior, cache._con is not None
+
+
+class TestCachePaginas(unittest.TestCase):
+    def test_dois_processos_gravando(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, ".cache")
+            CachePaginas(cache_dir).close()
+            paginas, pausa = 40, 0.025
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                futuros = [executor.submit(_gravar_paginas, cache_dir, doc, paginas, pausa) for doc in ("a", "b")]
+                resultados = [f.result() for f in futuros]
+            for maior, ativo in resultados:
+                self.assertTrue(ativo)
+                # Nenhum processo espera pelo documento inteiro do outro (~1 s)
+                self.assertLess(maior, paginas * pausa / 2)
+            with CachePaginas(cache_dir) as cache:
+                for doc in ("a", "b"):
+                    for pagina in (1, paginas):
+                        self.assertEqual(cache.obter(doc, pagina, TIPO_TEXTO), f"{doc} {pagina}".encode("utf-8"))
+
+    def test_extracao_reaproveita_paginas(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "pagos.pdf")
+            _pdf(pdf_path, LINHAS)
+            cache_dir = os.path.join(tmp, ".cache")
+            esperado = extrair_pagos(pdf_path)
+            self.assertEqual(extrair_pagos_cache(pdf_path, cache_dir=cache_dir), esperado)
+            with mock.patch.object(fitz.Page, "get_text", side_effect=AssertionError("página relida")):
+                self.assertEqual(extrair_pagos_cache(pdf_path, cache_dir=cache_dir), esperado)
+
+            # Conteúdo novo no mesmo caminho invalida o cache
+            _pdf(pdf_path, LINHAS + ["PEDRO ALVES   20,00 "])
+            self.assertIn("PEDRO ALVES", extrair_pagos_cache(pdf_path, cache_dir=cache_dir))
+
+    def test_destaque_igual_com_e_sem_cache(self):
+        nomes = ["JOAO DA SILVA", "MARIA JOSE", "NINGUEM"]
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "pagos.pdf")
+            _pdf(pdf_path, LINHAS)
+            cache_dir = os.path.join(tmp, ".cache")
+            sem_cache = os.path.join(tmp, "sem.pdf")
+            anotar_pdf_nomes(pdf_path, nomes, sem_cache)
+
+            saidas = []
+            for rodada in range(2):
+                saida = os.path.join(tmp, f"rodada{rodada}.pdf")
+                with mock.patch.object(annotate, "caracteres_pagina", wraps=caracteres_pagina) as extrair:
+                    anotar_pdf_nomes(pdf_path, nomes, saida, cache_dir=cache_dir)
+                saidas.append(saida)
+                self.assertEqual(extrair.call_count, 3 if rodada == 0 else 0)
+
+            for saida in saidas:
+                self.assertEqual(_destaques(saida), _destaques(sem_cache))
+
+    def test_codificar_fluxo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "pagos.pdf")
+            _pdf(pdf_path, LINHAS + ["PEDRO", "ALVES  ", "  LIMA"], paginas=1)
+            with fitz.open(pdf_path) as pdf:
+                fluxo = caracteres_pagina(pdf[0])
+        self.assertIn((), [caixas for _, caixas in fluxo])
+        self.assertTrue(any(len(caixas) > 1 for _, caixas in fluxo))
+        self.assertEqual(decodificar_fluxo(codificar_fluxo(fluxo)), fluxo)
+        self.assertIsNone(codificar_fluxo([("ab", ())]))
+
+    def test_hash_reaproveitado_por_caminho(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "pagos.pdf")
+            _pdf(pdf_path, LINHAS, paginas=1)
+            with CachePaginas(os.path.join(tmp, ".cache")) as cache:
+                documento = cache.documento(pdf_path)
+                with mock.patch("services.page_cache.hash_arquivo", side_effect=AssertionError("hash recalculado")):
+                    self.assertEqual(cache.documento(pdf_path), documento)
+
+
+if __name__ == "__main__":
+    unittest.main()
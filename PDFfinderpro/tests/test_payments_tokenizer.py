@@ -0,0 +1,45 @@
+import os
+import random
+import re
+import sys
+import time
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from constants.regex import REGEX_PAGAMENTOS  # noqa: E402
+from services.payments_tokenizer import tokenizar_pagamentos  # noqa: E402
+
+
+class TestTokenizadorPagamentos(unittest.TestCase):
+    def test_pagina_realista(self):
+        texto = (
+            "PREFEITURA MUNICIPAL\nRELAÇÃO DE PAGAMENTOS\n"
+            "JOSÉ DA SILVA\n1.234,56\nMARIA CONCEIÇÃO ÂNGELO\n987,00\n"
+            "ANTÔNIO  PEREIRA 12.345.678,9 \nTOTAL GERAL 14.567,56\n"
+            "Página 1 de 3\nJOÃO 1234,56\nPEDRO 1.23,00\n"
+        )
+        esperado = re.findall(REGEX_PAGAMENTOS, texto)
+        self.assertEqual(len(esperado), 4)
+        self.assertEqual(tokenizar_pagamentos(texto), esperado)
+
+    def test_aleatorio_igual_regex(self):
+        rnd = random.Random(13)
+        alfabeto = list("AaÉç ×\n\t12.,-9") + ["٣"]
+        for _ in range(20000):
+            texto = "".join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 25)))
+            self.assertEqual(tokenizar_pagamentos(texto), re.findall(REGEX_PAGAMENTOS, texto), repr(texto))
+
+    def test_pagina_adversaria_linear(self):
+        texto = "JOSÉ DA SILVA " * 20000 + "1,00 "
+        inicio = time.perf_counter()
+        resultado = tokenizar_pagamentos(texto)
+        self.assertLess(time.perf_counter() - inicio, 1.0)
+        self.assertEqual(len(resultado), 1)
+        self.assertEqual(resultado[0][1], "1,00 ")
+
+
+if __name__ == "__main__":
+    unittest.main()
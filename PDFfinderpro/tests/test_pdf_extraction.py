@@ -0,0 +1,60 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+import pymupdf as fitz  # type: ignore
+from PyPDF2 import PdfReader
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from constants.regex import REGEX_PROJETOS  # noqa: E402
+from services.pdf_extraction import extrair_projeto, iterar_matches  # noqa: E402
+from utils.formatting import formatar_moeda  # noqa: E402
+
+
+def _linhas(n):
+    return [
+        f" - SERVIDOR {chr(65 + i % 26)}{chr(65 + i // 26 % 26)} 123.456.789-{i % 100:02d} CARGO {i},{i % 100:02d}\n"
+        for i in range(n)
+    ]
+
+
+class TestIterarMatches(unittest.TestCase):
+    def test_igual_findall_com_cortes_arbitrarios(self):
+        texto = "".join(_linhas(300))
+        esperado = re.findall(REGEX_PROJETOS, texto)
+        for tamanho in (5, 64, 500, 4096):
+            paginas = [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+            self.assertEqual(list(iterar_matches(paginas, REGEX_PROJETOS, janela=100)), esperado)
+
+    def test_extrair_projeto_igual_texto_completo(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "projeto.pdf")
+            doc = fitz.open()
+            linhas = _linhas(120)
+            for p in range(0, len(linhas), 40):
+                page = doc.new_page()
+                for j, linha in enumerate(linhas[p:p + 40]):
+                    page.insert_text((40, 40 + j * 18), f"{p + j:03d}" + linha.rstrip(), fontsize=8)
+            doc.save(path)
+            doc.close()
+
+            # Referência: implementação original (texto inteiro + findall)
+            texto = "".join(page.extract_text() or "" for page in PdfReader(path).pages)
+            esperado = {}
+            for nome, valor in re.findall(REGEX_PROJETOS, texto):
+                esperado[nome.strip()] = formatar_moeda(float(valor.replace('.', '').replace(',', '.')))
+
+            progresso = []
+            obtido = extrair_projeto(path, progress_cb=progresso.append)
+        self.assertEqual(len(esperado), 120)
+        self.assertEqual(obtido, esperado)
+        self.assertEqual(progresso[-1], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
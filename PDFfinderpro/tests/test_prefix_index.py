@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.prefix_index import IndicePrefixos, IndicePrefixosPorValor  # noqa: E402
+
+
+class TestIndicePrefixos(unittest.TestCase):
+    def test_unico_e_ambiguo(self):
+        indice = IndicePrefixos(["JOAO DA SILVA", "JOAO DE SOUZA", "MARIA JOSE"])
+        self.assertIsNone(indice.unico("JOAO"))
+        self.assertEqual(indice.unico("JOAO D"), None)
+        self.assertEqual(indice.unico("JOAO DA"), "JOAO DA SILVA")
+        self.assertEqual(indice.unico("MARIA"), "MARIA JOSE")
+        self.assertIsNone(indice.unico("PEDRO"))
+        self.assertEqual(indice.contar("JOAO"), 2)
+        self.assertEqual(indice.buscar("JOAO D"), ["JOAO DA SILVA", "JOAO DE SOUZA"])
+
+    def test_igual_a_varredura(self):
+        rnd = random.Random(7)
+        chaves = {"".join(rnd.choice("ABC ") for _ in range(rnd.randint(1, 6))) for _ in range(200)}
+        indice = IndicePrefixos(chaves)
+        for _ in range(300):
+            prefixo = "".join(rnd.choice("ABC ") for _ in range(rnd.randint(1, 4)))
+            esperado = sorted(c for c in chaves if c.startswith(prefixo))
+            self.assertEqual(indice.buscar(prefixo), esperado)
+            self.assertEqual(indice.unico(prefixo), esperado[0] if len(esperado) == 1 else None)
+
+    def test_por_valor(self):
+        indice = IndicePrefixosPorValor({"ANA LIMA": "10,00", "ANA PAULA": "20,00"})
+        self.assertEqual(indice.unico("ANA", "10,00"), "ANA LIMA")
+        self.assertIsNone(indice.unico("ANA", "30,00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.totals import RelatorioTxt, atualizar_totais_txt, gravar_relatorio  # noqa: E402
+
+
+class TestRelatorioTxt(unittest.TestCase):
+    CASOS = [
+        [],
+        ["JOAO DA SILVA: 1.234,56\n", "MARIA: 10,00\n"],
+        ["Total de nomes não encontrados: 2\n", "JOAO\n", "MARIA\n"],
+        ["Total: 3,00\n", "ANA: 1,00\n", "Total: 5,00\n"],
+        ["Original: ANA LIMA: 10,00\nEncontrado como: ANA: 10,00\n", "Original: X: 2,00 -> Nenhuma\n"],
+        ["ANA\rLIMA: 1,00\n", "PEDRO\r", "\nALVES: 2,00\n", "SEM VALOR\n", "ULTIMA: 3,00"],
+        ["VALOR ESTRANHO: ,.\n"],
+    ]
+
+    def test_igual_a_atualizar_totais_txt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, linhas in enumerate(self.CASOS):
+                esperado_path = os.path.join(tmp, f"esperado{i}.txt")
+                with open(esperado_path, "w", encoding="utf-8") as f:
+                    f.writelines(linhas)
+                atualizar_totais_txt(esperado_path)
+
+                obtido_path = os.path.join(tmp, f"obtido{i}.txt")
+                self.assertEqual(gravar_relatorio(obtido_path, iter(linhas)), obtido_path)
+
+                with open(esperado_path, "rb") as a, open(obtido_path, "rb") as b:
+                    self.assertEqual(b.read(), a.read(), linhas)
+            self.assertFalse([f for f in os.listdir(tmp) if f.endswith(".tmp")])
+
+    def test_erro_preserva_arquivo_anterior(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rel.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("anterior\n")
+            with self.assertRaises(RuntimeError):
+                with RelatorioTxt(path) as relatorio:
+                    relatorio.escrever("ANA: 1,00\n")
+                    raise RuntimeError("falha")
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "anterior\n")
+            self.assertEqual(os.listdir(tmp), ["rel.txt"])
+
+    def test_sem_totais(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rel.txt")
+            gravar_relatorio(path, ["ANA: 1,00\n"], totais=False)
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "ANA: 1,00\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
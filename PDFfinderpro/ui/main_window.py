@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+import os
+from typing import List, Optional, Tuple
 
 from PySide6.QtWidgets import (
     QApplication,
@@ -12,6 +13,7 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QProgressBar,
     QPushButton,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
@@ -68,6 +70,18 @@ class MainWindow(QMainWindow):
         self.layout_saida.addWidget(self.btn_pasta_saida)
         self.layout.addLayout(self.layout_saida)
 
+        # Processos em paralelo (1 = serial)
+        self.label_processos = QLabel("Processos em paralelo:")
+        self.spin_processos = QSpinBox()
+        self.spin_processos.setRange(1, max(1, os.cpu_count() or 1))
+        self.spin_processos.setValue(1)
+
+        self.layout_processos = QHBoxLayout()
+        self.layout_processos.addWidget(self.label_processos)
+        self.layout_processos.addWidget(self.spin_processos)
+        self.layout_processos.addStretch()
+        self.layout.addLayout(self.layout_processos)
+
         # Barra de Progresso
         self.progress_bar = QProgressBar()
         self.layout.addWidget(self.progress_bar)
@@ -78,6 +92,7 @@ class MainWindow(QMainWindow):
         self.layout.addWidget(self.btn_iniciar)
 
         self.worker_thread: Optional[Worker] = None
+        self.erros_pdf: List[Tuple[str, str]] = []
 
     # ---------- Ações UI ----------
     def selecionar_arquivo_pagos(self) -> None:
@@ -108,12 +123,24 @@ class MainWindow(QMainWindow):
 
     def iniciar_thread(self, pdf_pagos_path: str, pdf_projetos_dir: str, base_output_dir: str) -> None:
         self.progress_bar.setValue(0)
-        self.worker_thread = Worker(pdf_pagos_path, pdf_projetos_dir, base_output_dir)
+        self.erros_pdf = []
+        self.worker_thread = Worker(pdf_pagos_path, pdf_projetos_dir, base_output_dir, self.spin_processos.value())
         self.worker_thread.progress_update.connect(self.progress_bar.setValue)
+        self.worker_thread.erro_pdf.connect(self.registrar_erro_pdf)
+        self.worker_thread.erro_geral.connect(self.exibir_erro_geral)
         self.worker_thread.finished.connect(self.processamento_finalizado)
         self.worker_thread.start()
 
+    def registrar_erro_pdf(self, nome_pdf: str, mensagem: str) -> None:
+        self.erros_pdf.append((nome_pdf, mensagem))
+
+    def exibir_erro_geral(self, mensagem: str) -> None:
+        QMessageBox.critical(self, "Erro", mensagem)
+
     def processamento_finalizado(self, base_output_dir: Optional[str]) -> None:
+        if self.erros_pdf:
+            detalhes = "\n".join(f"- {nome}: {msg}" for nome, msg in self.erros_pdf)
+            QMessageBox.warning(self, "Atenção", f"Alguns PDFs não foram processados:\n{detalhes}")
         if QMessageBox.question(self, "Concluído", "Todos os PDFs foram processados! Deseja continuar?") == QMessageBox.Yes:
             self.limpar_campos()
         else:
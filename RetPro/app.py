@@ -1,10 +1,13 @@
-from PySide6.QtWidgets import QApplication
+from multiprocessing import freeze_support
 import sys
 
-from ui.main_window import JanelaPrincipal
-
 
 def main() -> int:
+    # Importado aqui para que o modo linha de comando não carregue o Qt
+    from PySide6.QtWidgets import QApplication
+
+    from ui.main_window import JanelaPrincipal
+
     app = QApplication.instance() or QApplication(sys.argv)
     janela = JanelaPrincipal()
     janela.show()
@@ -12,4 +15,10 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    freeze_support()  # necessário para o pool de processos em executáveis congelados
+    if len(sys.argv) > 1:
+        # Com argumentos: execução em lote, sem interface (ver cli.py)
+        from cli import main as main_cli
+
+        sys.exit(main_cli())
     sys.exit(main())
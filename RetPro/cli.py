@@ -0,0 +1,84 @@
+"""
+Execução em lote, sem interface gráfica (não importa PySide6).
+
+Uso:
+    python cli.py PASTA_RET PASTA_PDF SAIDA [--csv] [--sem-valores] [--processos N]
+                  [--leitor {pymupdf,pypdf2}] [--banco CAMINHO]
+
+O progresso e as falhas por arquivo vão para stderr. Códigos de saída:
+0 = concluído, 1 = concluído com arquivos que falharam, 2 = argumentos inválidos.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from multiprocessing import freeze_support
+from typing import List, Optional
+
+from services.pdf_extraction import BACKENDS, DEFAULT_BACKEND
+from services.pipeline import BANCO_PADRAO, processar_retornos
+from utils.formatting import format_currency
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="retpro",
+        description="Extrai nomes de arquivos .ret/.txt, cruza com o banco dos PDFs e gera CSV/TXT.",
+    )
+    parser.add_argument("pasta_ret", help="pasta com os arquivos .ret/.txt")
+    parser.add_argument("pasta_pdf", help="pasta com os PDFs do banco de dados")
+    parser.add_argument("saida", help="arquivo de saída (CSV ou TXT)")
+    parser.add_argument("--csv", action="store_true", help="gera CSV em vez de TXT")
+    parser.add_argument("--sem-valores", action="store_true", help="não inclui valores nem o total na saída")
+    parser.add_argument("--processos", type=int, default=1, help="processos para leitura (1 = serial)")
+    parser.add_argument("--leitor", choices=list(BACKENDS), default=DEFAULT_BACKEND, help="biblioteca de leitura dos PDFs")
+    parser.add_argument("--banco", default=BANCO_PADRAO, help="caminho do banco SQLite (ou .json legado)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    for pasta in (args.pasta_ret, args.pasta_pdf):
+        if not os.path.isdir(pasta):
+            parser.error(f"pasta não encontrada: {pasta}")
+
+    ultimo_progresso = -1
+
+    def progresso(pct: int) -> None:
+        nonlocal ultimo_progresso
+        if pct != ultimo_progresso:
+            ultimo_progresso = pct
+            print(f"Banco de dados: {pct}%", file=sys.stderr)
+
+    def erro_pdf(nome: str, erro: str) -> None:
+        print(f"Falha no PDF {nome}: {erro}", file=sys.stderr)
+
+    def erro_ret(nome: str, erro: str) -> None:
+        print(f"Falha no retorno {nome}: {erro}", file=sys.stderr)
+
+    resumo = processar_retornos(
+        args.pasta_ret,
+        args.saida,
+        args.pasta_pdf,
+        incluir_valores=not args.sem_valores,
+        saida_csv=args.csv,
+        banco_path=args.banco,
+        max_workers=max(1, args.processos),
+        backend=args.leitor,
+        progress_cb=progresso,
+        erro_pdf_cb=erro_pdf,
+        erro_ret_cb=erro_ret,
+    )
+
+    print(f"Total de nomes encontrados: {resumo['total_nomes']}", file=sys.stderr)
+    if not args.sem_valores:
+        print(f"Valor total : {format_currency(resumo['total_valores'])}", file=sys.stderr)
+    print(f"Saída: {args.saida}", file=sys.stderr)
+    return 1 if resumo["falhas_pdf"] or resumo["erros_ret"] else 0
+
+
+if __name__ == "__main__":
+    freeze_support()  # necessário para o pool de processos em executáveis congelados
+    sys.exit(main())
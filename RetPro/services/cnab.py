@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Layout CNAB 240 (FEBRABAN), posições 1-based inclusivas convertidas para fatias
+CNAB240_TAMANHO = 240
+CNAB240_TIPO_REGISTRO = slice(7, 8)        # 8: 0 header arquivo, 1 header lote, 3 detalhe, 5/9 trailers
+CNAB240_SEGMENTO = slice(13, 14)           # 14: A, B, ...
+CNAB240_A_NOME = slice(43, 73)             # 44-73: nome do favorecido
+CNAB240_A_VALOR = slice(119, 134)          # 120-134: valor do pagamento (13 inteiros + 2 decimais)
+CNAB240_B_TIPO_INSCRICAO = slice(17, 18)   # 18: 1 = CPF, 2 = CNPJ
+CNAB240_B_INSCRICAO = slice(18, 32)        # 19-32: CPF/CNPJ do favorecido
+
+
+def is_cnab240(primeira_linha: str) -> bool:
+    """True se a linha é um header de arquivo CNAB 240 (240 colunas, tipo 0)."""
+    linha = primeira_linha.rstrip("\r\n")
+    return len(linha) == CNAB240_TAMANHO and linha[CNAB240_TIPO_REGISTRO] == "0"
+
+
+def _valor(campo: str) -> Optional[float]:
+    campo = campo.strip()
+    if not campo.isdigit():
+        return None
+    return int(campo) / 100
+
+
+def _cpf(tipo: str, campo: str) -> Optional[str]:
+    """CPF no formato do banco de PDFs (000.000.000-00); None para CNPJ/inválido."""
+    campo = campo.strip()
+    if tipo != "1" or not campo.isdigit():
+        return None
+    d = campo[-11:].zfill(11)
+    return f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}"
+
+
+def parse_cnab240(
+    linhas: Iterable[str],
+    aceitar_linha: Optional[Callable[[str], bool]] = None,
+) -> List[Dict[str, Any]]:
+    """Extrai {nome, cpf, valor} dos segmentos A/B de um retorno CNAB 240.
+
+    Os campos são fatiados pelas colunas do layout, sem regex. O CPF vem do
+    segmento B que segue o A. `aceitar_linha` recebe a linha do segmento A
+    (com a quebra de linha original) e permite descartar o registro, como os
+    filtros de ocorrência do parser por regex.
+    """
+    registros: List[Dict[str, Any]] = []
+    atual: Optional[Dict[str, Any]] = None
+    for linha in linhas:
+        campos = linha.rstrip("\r\n")
+        if len(campos) < CNAB240_TAMANHO or campos[CNAB240_TIPO_REGISTRO] != "3":
+            atual = None
+            continue
+        segmento = campos[CNAB240_SEGMENTO]
+        if segmento == "A":
+            atual = None
+            if aceitar_linha is not None and not aceitar_linha(linha):
+                continue
+            nome = campos[CNAB240_A_NOME].strip()
+            if not nome:
+                continue
+            atual = {"nome": nome, "cpf": None, "valor": _valor(campos[CNAB240_A_VALOR])}
+            registros.append(atual)
+        elif segmento == "B" and atual is not None:
+            atual["cpf"] = _cpf(campos[CNAB240_B_TIPO_INSCRICAO], campos[CNAB240_B_INSCRICAO])
+            atual = None
+    return registros
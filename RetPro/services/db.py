@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+import sqlite3
+import sys
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 def save_data_to_json(data: Dict[str, Any], output_path: str) -> None:
@@ -15,3 +18,278 @@ def load_data_from_json(output_path: str) -> Dict[str, Any]:
             return json.load(f)
     except FileNotFoundError:
         return {}
+
+
+# ---------------- Banco SQLite ----------------
+#
+# Tabelas:
+# - arquivos: um registro por PDF de origem (ordem na pasta + impressão digital
+#   + backend de extração usado)
+# - pessoas: um registro por (nome, CPF, PDF de origem)
+# Índices em nome (consultas exatas e por prefixo, via intervalo) e em CPF.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    arquivo TEXT PRIMARY KEY,
+    ordem INTEGER NOT NULL DEFAULT 0,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    backend TEXT
+);
+CREATE TABLE IF NOT EXISTS pessoas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    cpf TEXT,
+    valor REAL,
+    arquivo TEXT NOT NULL REFERENCES arquivos(arquivo) ON DELETE CASCADE,
+    UNIQUE (nome, cpf, arquivo)
+);
+CREATE INDEX IF NOT EXISTS idx_pessoas_nome ON pessoas (nome);
+CREATE INDEX IF NOT EXISTS idx_pessoas_cpf ON pessoas (cpf);
+CREATE INDEX IF NOT EXISTS idx_pessoas_arquivo ON pessoas (arquivo);
+"""
+
+# (arquivo de origem, dado bruto {"cpf", "valor"})
+Ocorrencia = Tuple[str, Any]
+# (nome, arquivo de origem, dado bruto)
+Registro = Tuple[str, str, Any]
+
+
+def prefix_upper_bound(prefixo: str) -> Optional[str]:
+    """Menor string maior que todas as que começam com `prefixo` (None se não houver)."""
+    while prefixo and ord(prefixo[-1]) == sys.maxunicode:
+        prefixo = prefixo[:-1]
+    if not prefixo:
+        return None
+    return prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+
+
+def normalize_cpf(cpf: Optional[str]) -> Optional[str]:
+    """CPF só com os 11 dígitos (zeros à esquerda completados); None se inválido."""
+    if not cpf:
+        return None
+    digitos = "".join(c for c in cpf if c.isdigit())
+    if not digitos or len(digitos) > 11:
+        return None
+    return digitos.zfill(11)
+
+
+def format_cpf(cpf: Optional[str]) -> Optional[str]:
+    """CPF no formato gravado no banco (000.000.000-00); None se inválido."""
+    d = normalize_cpf(cpf)
+    if d is None:
+        return None
+    return f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}"
+
+
+class SQLiteDatabase:
+    """Banco de nomes em SQLite com consultas indexadas por nome, prefixo e CPF."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        self._migrar()
+
+    def _migrar(self) -> None:
+        # Bancos criados antes da coluna `backend`: registros sem backend
+        # são reextraídos na próxima atualização
+        colunas = {linha[1] for linha in self.conn.execute("PRAGMA table_info(arquivos)")}
+        if "backend" not in colunas:
+            self.conn.execute("ALTER TABLE arquivos ADD COLUMN backend TEXT")
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SQLiteDatabase":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ---------- escrita ----------
+    def fingerprints(self) -> Dict[str, Dict[str, Any]]:
+        cur = self.conn.execute("SELECT arquivo, size, mtime_ns, sha256, backend FROM arquivos")
+        return {a: {"size": s, "mtime_ns": m, "sha256": h, "backend": b} for a, s, m, h, b in cur}
+
+    def replace_file(
+        self,
+        arquivo: str,
+        dados: Dict[str, Any],
+        ordem: int = 0,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Substitui todos os registros de um PDF de origem (sem commit)."""
+        fp = fingerprint or {}
+        self.conn.execute("DELETE FROM pessoas WHERE arquivo = ?", (arquivo,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO arquivos (arquivo, ordem, size, mtime_ns, sha256, backend)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (arquivo, ordem, fp.get("size"), fp.get("mtime_ns"), fp.get("sha256"), fp.get("backend")),
+        )
+        linhas = []
+        for nome, raw in dados.items():
+            if isinstance(raw, dict):
+                linhas.append((nome, raw.get("cpf"), raw.get("valor"), arquivo))
+            else:
+                linhas.append((nome, None, raw, arquivo))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pessoas (nome, cpf, valor, arquivo) VALUES (?, ?, ?, ?)", linhas
+        )
+
+    def replace_fingerprint(self, arquivo: str, ordem: int, fingerprint: Dict[str, Any]) -> None:
+        """Atualiza ordem e impressão digital de um PDF já gravado (sem commit)."""
+        self.conn.execute(
+            "UPDATE arquivos SET ordem = ?, size = ?, mtime_ns = ?, sha256 = ?, backend = ? WHERE arquivo = ?",
+            (
+                ordem,
+                fingerprint.get("size"),
+                fingerprint.get("mtime_ns"),
+                fingerprint.get("sha256"),
+                fingerprint.get("backend"),
+                arquivo,
+            ),
+        )
+
+    def remove_file(self, arquivo: str) -> None:
+        self.conn.execute("DELETE FROM arquivos WHERE arquivo = ?", (arquivo,))
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    # ---------- leitura ----------
+    _SELECT = (
+        "SELECT p.nome, p.arquivo, p.cpf, p.valor FROM pessoas p "
+        "JOIN arquivos a ON a.arquivo = p.arquivo "
+    )
+    _ORDER = " ORDER BY a.ordem, p.id"
+
+    @staticmethod
+    def _registro(row: Tuple[str, str, Optional[str], Optional[float]]) -> Registro:
+        nome, arquivo, cpf, valor = row
+        return nome, arquivo, {"cpf": cpf, "valor": valor}
+
+    def exact(self, nome: str) -> List[Ocorrencia]:
+        cur = self.conn.execute(self._SELECT + "WHERE p.nome = ?" + self._ORDER, (nome,))
+        return [(arquivo, raw) for _, arquivo, raw in map(self._registro, cur)]
+
+    def prefix(self, prefixo: str, limit: Optional[int] = None) -> List[Registro]:
+        """Registros cujo nome começa com `prefixo`, em ordem de nome.
+
+        A consulta é um intervalo no índice de nome; ordenar pelo próprio
+        índice permite parar no LIMIT sem ler o intervalo inteiro.
+        """
+        fim = prefix_upper_bound(prefixo)
+        sql = self._SELECT + "WHERE p.nome >= ?"
+        params: List[Any] = [prefixo]
+        if fim is not None:
+            sql += " AND p.nome < ?"
+            params.append(fim)
+        sql += " ORDER BY p.nome, a.ordem, p.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._registro(r) for r in self.conn.execute(sql, params)]
+
+    def by_cpf(self, cpf: str) -> List[Registro]:
+        """Registros com este CPF (com ou sem pontuação), na ordem do banco."""
+        formatado = format_cpf(cpf)
+        if formatado is None:
+            return []
+        cur = self.conn.execute(self._SELECT + "WHERE p.cpf = ?" + self._ORDER, (formatado,))
+        return [self._registro(r) for r in cur]
+
+    def all_records(self) -> Iterator[Registro]:
+        for row in self.conn.execute(self._SELECT + self._ORDER):
+            yield self._registro(row)
+
+    # ---------- intercâmbio JSON ----------
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        data: Dict[str, Dict[str, Any]] = {}
+        for nome, arquivo, raw in self.all_records():
+            data.setdefault(arquivo, {})[nome] = raw
+        return data
+
+    def import_dict(self, data: Dict[str, Dict[str, Any]]) -> None:
+        for ordem, (arquivo, dados) in enumerate(data.items()):
+            self.replace_file(arquivo, dados, ordem)
+        self.commit()
+
+
+class MemoryDatabase:
+    """Mesma interface de consulta do SQLiteDatabase sobre o dict do banco JSON."""
+
+    def __init__(self, data: Dict[str, Dict[str, Any]]) -> None:
+        self.data = data
+        # Index auxiliar: nome -> lista de (arquivo, dado)
+        self.index: Dict[str, List[Ocorrencia]] = {}
+        for nome_arquivo_db, dados in data.items():
+            for nome, raw in dados.items():
+                self.index.setdefault(nome, []).append((nome_arquivo_db, raw))
+        # Chaves do mesmo índice, ordenadas: nomes com um prefixo formam um
+        # intervalo contíguo, localizado com bisect
+        self.sorted_names: List[str] = sorted(self.index)
+        # Índice hash por CPF (só dígitos): cpf -> lista de (nome, arquivo, dado)
+        self.cpf_index: Dict[str, List[Registro]] = {}
+        for nome, arquivo, raw in self.all_records():
+            cpf = normalize_cpf(raw.get("cpf")) if isinstance(raw, dict) else None
+            if cpf is not None:
+                self.cpf_index.setdefault(cpf, []).append((nome, arquivo, raw))
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "MemoryDatabase":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def exact(self, nome: str) -> List[Ocorrencia]:
+        return list(self.index.get(nome, []))
+
+    def prefix(self, prefixo: str, limit: Optional[int] = None) -> List[Registro]:
+        """Registros cujo nome começa com `prefixo`, em ordem de nome (O(log n) + resultado)."""
+        encontrados: List[Registro] = []
+        nomes = self.sorted_names
+        for pos in range(bisect_left(nomes, prefixo), len(nomes)):
+            nome = nomes[pos]
+            if not nome.startswith(prefixo):
+                break
+            for arquivo, raw in self.index[nome]:
+                encontrados.append((nome, arquivo, raw))
+                if limit is not None and len(encontrados) >= limit:
+                    return encontrados
+        return encontrados
+
+    def by_cpf(self, cpf: str) -> List[Registro]:
+        """Registros com este CPF (com ou sem pontuação), na ordem do banco."""
+        return list(self.cpf_index.get(normalize_cpf(cpf) or "", []))
+
+    def all_records(self) -> Iterator[Registro]:
+        for arquivo, dados in self.data.items():
+            for nome, raw in dados.items():
+                yield nome, arquivo, raw
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return self.data
+
+
+def open_database(path: str):
+    """Abre o banco conforme a extensão: .json (legado, em memória) ou SQLite."""
+    if path.lower().endswith(".json"):
+        return MemoryDatabase(load_data_from_json(path))
+    return SQLiteDatabase(path)
+
+
+def export_sqlite_to_json(sqlite_path: str, json_path: str) -> None:
+    with SQLiteDatabase(sqlite_path) as db:
+        save_data_to_json(db.to_dict(), json_path)
+
+
+def import_json_to_sqlite(json_path: str, sqlite_path: str) -> None:
+    with SQLiteDatabase(sqlite_path) as db:
+        db.import_dict(load_data_from_json(json_path))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.db import SQLiteDatabase
+from services.pdf_extraction import DEFAULT_BACKEND, read_data
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract_file(pdf_path: str, backend: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Extrai um PDF devolvendo (dados, erro); roda no processo do pool."""
+    try:
+        return read_data(pdf_path, backend), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def build_database_incremental(
+    pasta_pdf: str,
+    banco_path: str,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    max_workers: int = 1,
+    backend: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """Atualiza o banco SQLite reextraindo apenas PDFs novos ou alterados.
+
+    Cada PDF é identificado por tamanho, mtime e SHA-256 (tabela `arquivos`).
+    Se tamanho e mtime batem com a execução anterior, os dados são
+    reaproveitados sem ler o arquivo; se só o mtime mudou mas o conteúdo é o
+    mesmo, também. O backend usado fica junto da impressão digital: PDFs
+    extraídos com outro backend são reextraídos. Registros de PDFs que não
+    estão mais na pasta são apagados.
+
+    Com max_workers > 1 a extração roda em um pool de processos; os resultados
+    são gravados na ordem dos arquivos. Retorna (arquivo, erro) dos PDFs que
+    falharam, sem interromper os demais. `backend` escolhe a biblioteca de
+    leitura dos PDFs (ver services.pdf_extraction.BACKENDS).
+    """
+    pdf_files = sorted(f for f in os.listdir(pasta_pdf) if f.lower().endswith(".pdf"))
+    total_files = max(1, len(pdf_files))
+    concluidos = 0
+
+    def avancar() -> None:
+        nonlocal concluidos
+        concluidos += 1
+        if progress_cb:
+            progress_cb(int(concluidos / total_files * 100))
+
+    backend = backend or DEFAULT_BACKEND
+    falhas: List[Tuple[str, str]] = []
+    with SQLiteDatabase(banco_path) as banco:
+        fps_anteriores = banco.fingerprints()
+
+        # 1) Decide o que reaproveitar e o que extrair
+        pendentes: List[Tuple[int, str, Dict[str, Any], bool]] = []
+        for i, filename in enumerate(pdf_files):
+            pdf_path = os.path.join(pasta_pdf, filename)
+            st = os.stat(pdf_path)
+            anterior = fps_anteriores.pop(filename, None)
+
+            reaproveitar = False
+            if anterior and anterior.get("size") == st.st_size and anterior.get("backend") == backend:
+                if anterior.get("mtime_ns") == st.st_mtime_ns:
+                    sha256 = anterior.get("sha256")
+                    reaproveitar = True
+                else:
+                    sha256 = file_sha256(pdf_path)
+                    reaproveitar = sha256 == anterior.get("sha256")
+            else:
+                sha256 = file_sha256(pdf_path)
+            fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256, "backend": backend}
+
+            if reaproveitar:
+                banco.replace_fingerprint(filename, i, fp)
+                avancar()
+            else:
+                pendentes.append((i, filename, fp, anterior is not None))
+
+        # 2) Extrai os pendentes (serial ou em pool), progresso por arquivo concluído
+        resultados: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+        if max_workers > 1 and len(pendentes) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futuros = {
+                    executor.submit(_extract_file, os.path.join(pasta_pdf, filename), backend): i
+                    for i, filename, _, _ in pendentes
+                }
+                for futuro in as_completed(futuros):
+                    try:
+                        resultados[futuros[futuro]] = futuro.result()
+                    except Exception as e:
+                        resultados[futuros[futuro]] = (None, f"{type(e).__name__}: {e}")
+                    avancar()
+        else:
+            for i, filename, _, _ in pendentes:
+                resultados[i] = _extract_file(os.path.join(pasta_pdf, filename), backend)
+                avancar()
+
+        # 3) Grava na ordem dos arquivos
+        for i, filename, fp, existia in pendentes:
+            dados, erro = resultados[i]
+            if erro is None:
+                banco.replace_file(filename, dados or {}, i, fp)
+            else:
+                # Falhou: não grava o PDF, que volta a ser tentado na próxima execução
+                print(f"Erro ao processar o arquivo PDF {filename}: {erro}")
+                falhas.append((filename, erro))
+                if existia:
+                    banco.remove_file(filename)
+
+        # O que sobrou não está mais na pasta
+        for filename in fps_anteriores:
+            banco.remove_file(filename)
+        banco.commit()
+    return falhas
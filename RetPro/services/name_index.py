@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (nome, arquivo de origem, dado bruto)
+Registro = Tuple[str, str, Any]
+
+_N = 3
+
+
+def _ngramas(texto: str) -> set:
+    return {texto[i:i + _N] for i in range(len(texto) - _N + 1)}
+
+
+class TokenIndex:
+    """Índice invertido para a busca "Tentativa" por tokens do nome.
+
+    A busca original aceita um registro quando cada token (minúsculo, com mais
+    de 2 letras) aparece como *substring* do nome do banco em minúsculas. Para
+    manter essa semântica, as listas de postings são por trigramas: todo token
+    tem pelo menos um trigrama, e um nome só pode conter o token se contiver
+    todos os trigramas dele. A interseção das listas dá poucos candidatos, que
+    são confirmados com a mesma checagem de substring.
+    """
+
+    def __init__(self, registros: Iterable[Registro]) -> None:
+        self.registros: List[Registro] = list(registros)
+        self._nomes_low: List[str] = [nome.lower() for nome, _, _ in self.registros]
+        postings: Dict[str, List[int]] = {}
+        for rid, nome_low in enumerate(self._nomes_low):
+            for grama in _ngramas(nome_low):
+                postings.setdefault(grama, []).append(rid)
+        self._postings = postings
+
+    def search(self, tokens: List[str], limit: Optional[int] = None) -> List[Registro]:
+        """Registros (na ordem do banco) cujo nome contém todos os tokens."""
+        if not tokens:
+            return []
+        gramas = set()
+        for tok in tokens:
+            if len(tok) < _N:
+                # Tokens curtos não têm trigrama: sem filtro, varre tudo
+                return self._varrer(range(len(self.registros)), tokens, limit)
+            gramas |= _ngramas(tok)
+
+        listas = []
+        for grama in gramas:
+            lista = self._postings.get(grama)
+            if not lista:
+                return []
+            listas.append(lista)
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for lista in listas[1:]:
+            candidatos.intersection_update(lista)
+            if not candidatos:
+                return []
+        return self._varrer(sorted(candidatos), tokens, limit)
+
+    def _varrer(self, ids: Iterable[int], tokens: List[str], limit: Optional[int]) -> List[Registro]:
+        encontrados: List[Registro] = []
+        for rid in ids:
+            nome_low = self._nomes_low[rid]
+            if all(tok in nome_low for tok in tokens):
+                encontrados.append(self.registros[rid])
+                if limit is not None and len(encontrados) >= limit:
+                    break
+        return encontrados
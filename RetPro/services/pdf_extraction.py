@@ -1,33 +1,133 @@
 from __future__ import annotations
 
 import re
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from PyPDF2 import PdfReader
 
 from constants.regex import PDF_NAME_CPF_VALUE
 
+try:  # PyMuPDF é opcional: sem ele, fica só o backend PyPDF2
+    import pymupdf as fitz  # type: ignore
+except ImportError:  # pragma: no cover - depende do ambiente
+    fitz = None
 
-def extract_data(pdf_path: str) -> Dict[str, Dict[str, float]]:
-    """Extrai nomes, CPF e valor líquido de um PDF e retorna dict nome -> {cpf, valor}."""
+
+def _paginas_pypdf2(pdf_path: str) -> Iterator[str]:
+    reader = PdfReader(pdf_path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _linhas_pagina_pymupdf(page) -> List[str]:
+    """Reconstrói as linhas visuais de uma página.
+
+    O MuPDF devolve cada objeto de texto como uma linha própria, então uma
+    linha de tabela (nome, CPF e valor escritos em posições diferentes) viria
+    quebrada em várias. Aqui as linhas são agrupadas pela altura na página e
+    ordenadas da esquerda para a direita, como o PyPDF2 faz.
+    """
+    fragmentos = []
+    for bloco in page.get_text("dict")["blocks"]:
+        for linha in bloco.get("lines", []):
+            texto = "".join(span["text"] for span in linha["spans"])
+            if texto.strip():
+                x0, y0, _, y1 = linha["bbox"]
+                fragmentos.append((y0, y1, x0, texto))
+    fragmentos.sort(key=lambda f: ((f[0] + f[1]) / 2, f[2]))
+
+    linhas: List[list] = []  # [meio, [(x0, texto)]]
+    for y0, y1, x0, texto in fragmentos:
+        meio = (y0 + y1) / 2
+        if linhas and abs(linhas[-1][0] - meio) <= (y1 - y0) / 2:
+            linhas[-1][1].append((x0, texto))
+        else:
+            linhas.append([meio, [(x0, texto)]])
+    return [" ".join(texto for _, texto in sorted(partes)) for _, partes in linhas]
+
+
+def _paginas_pymupdf(pdf_path: str) -> Iterator[str]:
+    if fitz is None:
+        raise RuntimeError("PyMuPDF não está instalado (pip install pymupdf)")
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            yield "\n".join(_linhas_pagina_pymupdf(page)) + "\n"
+
+
+# Backends de extração: nome -> função que gera o texto de cada página
+BACKENDS: Dict[str, Callable[[str], Iterator[str]]] = {
+    "pymupdf": _paginas_pymupdf,
+    "pypdf2": _paginas_pypdf2,
+}
+DEFAULT_BACKEND = "pymupdf" if fitz is not None else "pypdf2"
+
+
+def _backend(nome: Optional[str]) -> Callable[[str], Iterator[str]]:
+    nome = nome or DEFAULT_BACKEND
+    try:
+        return BACKENDS[nome]
+    except KeyError:
+        raise ValueError(f"Backend de extração desconhecido: {nome}") from None
+
+
+# Caracteres do fim de uma página guardados para a próxima: um registro que
+# cruza a quebra de página cabe nessa janela.
+CARRY_WINDOW = 1024
+
+
+def iter_matches(paginas: Iterable[str], pattern: str, window: int = CARRY_WINDOW) -> Iterator[tuple]:
+    """Aplica `pattern` ao texto página a página, como um re.findall no todo.
+
+    Só saem os matches que terminam antes dos últimos `window` caracteres do
+    buffer; o restante (a partir do primeiro match ainda incerto) segue para a
+    página seguinte. Assim a memória fica limitada a uma página mais a janela,
+    desde que nenhum registro seja maior que a janela.
+    """
+    regex = re.compile(pattern)
+    buffer = ""
+    for texto in paginas:
+        buffer += texto
+        limite = len(buffer) - window
+        corte = max(0, limite)
+        for m in regex.finditer(buffer):
+            if m.end() > limite:
+                corte = m.start()
+                break
+            yield m.groups()
+            corte = max(m.end(), limite)
+        buffer = buffer[corte:]
+    for m in regex.finditer(buffer):
+        yield m.groups()
+
+
+def iter_records(pdf_path: str, backend: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+    """Gera (nome, cpf, valor) na ordem do documento, à medida que as páginas são lidas."""
+    for name, cpf, value in iter_matches(_backend(backend)(pdf_path), PDF_NAME_CPF_VALUE):
+        yield name.strip(), cpf, value
+
+
+def read_data(pdf_path: str, backend: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Como extract_data, mas propaga erros de leitura (para relatórios de falha)."""
+    extracted_data: Dict[str, Dict[str, float]] = {}
+    for name, cpf, value in iter_records(pdf_path, backend):
+        value_norm = value.replace(".", "").replace(",", ".")
+        try:
+            value_f = float(value_norm)
+            extracted_data[name] = {"cpf": cpf, "valor": value_f}
+        except ValueError:
+            # ignora valores inválidos
+            pass
+    return extracted_data
+
+
+def extract_data(pdf_path: str, backend: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Extrai nomes, CPF e valor líquido de um PDF e retorna dict nome -> {cpf, valor}.
+
+    `backend` escolhe a biblioteca de leitura ("pymupdf" ou "pypdf2"); o padrão
+    é PyMuPDF quando instalado.
+    """
     try:
-        reader = PdfReader(pdf_path)
-        all_text = ""
-        for page in reader.pages:
-            all_text += page.extract_text() or ""
-
-        matches = re.findall(PDF_NAME_CPF_VALUE, all_text)
-        extracted_data: Dict[str, Dict[str, float]] = {}
-        for name, cpf, value in matches:
-            name = name.strip()
-            value_norm = value.replace(".", "").replace(",", ".")
-            try:
-                value_f = float(value_norm)
-                extracted_data[name] = {"cpf": cpf, "valor": value_f}
-            except ValueError:
-                # ignora valores inválidos
-                pass
-        return extracted_data
+        return read_data(pdf_path, backend)
     except Exception as e:
         print(f"Erro ao processar o arquivo PDF: {e}")
         return {}
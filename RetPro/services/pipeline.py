@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from services.db_builder import build_database_incremental
+from services.ret_processing import buscar_no_banco, parse_ret_records
+from services.writers import write_csv, write_txt
+
+# Banco SQLite padrão, na pasta do RetPro
+BANCO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "banco_de_dados.sqlite3")
+
+
+def processar_retornos(
+    pasta: str,
+    arquivo_saida: str,
+    pasta_pdf: str,
+    incluir_valores: bool,
+    saida_csv: bool,
+    banco_path: str = BANCO_PADRAO,
+    max_workers: int = 1,
+    backend: Optional[str] = None,
+    progress_cb: Optional[Callable[[int], None]] = None,
+    erro_pdf_cb: Optional[Callable[[str, str], None]] = None,
+    erro_ret_cb: Optional[Callable[[str, str], None]] = None,
+) -> Dict[str, Any]:
+    """Execução completa, sem dependência de interface gráfica.
+
+    Atualiza o banco a partir dos PDFs, lê os .ret/.txt, cruza com o banco e
+    grava a saída (CSV ou TXT). Falhas por arquivo vão para os callbacks e
+    não interrompem o lote. Retorna um resumo da execução.
+    """
+    # Atualiza o banco a partir dos PDFs (só reextrai novos/alterados)
+    falhas_pdf = build_database_incremental(pasta_pdf, banco_path, progress_cb, max_workers, backend)
+    if erro_pdf_cb:
+        for nome_pdf, erro in falhas_pdf:
+            erro_pdf_cb(nome_pdf, erro)
+
+    # Lê os .ret/.txt no lugar
+    erros_ret: list[tuple[str, str]] = []
+    registros, nomes_por_arquivo = parse_ret_records(pasta, max_workers, erros_ret)
+    if erro_ret_cb:
+        for nome_ret, erro in erros_ret:
+            erro_ret_cb(nome_ret, erro)
+    nomes = [r["nome"] for r in registros]
+    total_nomes = len(nomes)
+    # CPF do retorno (CNAB) casa direto pelo índice de CPF; sem CPF, busca por nome
+    cpfs = [r["cpf"] for r in registros]
+    all_results, total_valores, resultados_por_arquivo = buscar_no_banco(
+        nomes, banco_path, incluir_valores, cpfs
+    )
+
+    # Gera saída
+    if saida_csv:
+        write_csv(arquivo_saida, all_results, total_valores, total_nomes, incluir_valores)
+    else:
+        write_txt(arquivo_saida, resultados_por_arquivo, total_valores, total_nomes, incluir_valores)
+
+    return {
+        "total_nomes": total_nomes,
+        "total_valores": total_valores,
+        "nomes_por_arquivo": nomes_por_arquivo,
+        "falhas_pdf": falhas_pdf,
+        "erros_ret": erros_ret,
+    }
@@ -1,165 +1,250 @@
 from __future__ import annotations
 
-import glob
+import itertools
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from constants.regex import RET_EXCLUDE_SUFFIX, RET_NAME_LINE
-from services.db import load_data_from_json
+from services.cnab import is_cnab240, parse_cnab240
+from services.db import normalize_cpf, open_database
+from services.name_index import TokenIndex
 from utils.formatting import format_currency
+from utils.ret_file import ler_linhas, listar_arquivos_retorno, pular_cabecalho_rodape
 
+_REGEX_EXCLUIR = re.compile(RET_EXCLUDE_SUFFIX)
+_REGEX_NOME = re.compile(RET_NAME_LINE)
 
-def parse_ret_txt_files(folder: str) -> Tuple[List[str], int, Dict[str, int]]:
-    """Lê .txt na pasta, filtra linhas, extrai nomes e retorna:
-    - nomes_encontrados (lista)
-    - total_nomes_encontrados (int)
-    - nomes_por_arquivo (dict filename -> count)
+
+# Linhas com esta ocorrência (agendado, não pago) são ignoradas
+PALAVRA_EXCLUIDA = "0BD"
+
+
+def _linha_aceita(line: str) -> bool:
+    return PALAVRA_EXCLUIDA not in line and not _REGEX_EXCLUIR.search(line)
+
+
+def parse_ret_file(file_path: str) -> List[Dict[str, Any]]:
+    """Lê um arquivo de retorno e devolve registros {nome, cpf, valor}.
+
+    Retornos CNAB 240 são lidos pelas colunas do layout (services.cnab), o
+    que também traz CPF e valor. Outros arquivos seguem o caminho por regex:
+    linhas ímpares fora do cabeçalho/rodapé, com cpf e valor None. O arquivo
+    é lido em fluxo (utils.ret_file.ler_linhas), sem carregar todas as linhas.
     """
-    palavra_excluida = "0BD"
-    regex_excluir = re.compile(RET_EXCLUDE_SUFFIX)
-    regex_nome = re.compile(RET_NAME_LINE)
+    linhas = ler_linhas(file_path)
+    primeira = next(linhas, None)
+    if primeira is None:
+        return []
+    linhas = itertools.chain([primeira], linhas)
+    if is_cnab240(primeira):
+        return parse_cnab240(linhas, _linha_aceita)
 
-    nomes_encontrados_total: List[str] = []
-    nomes_por_arquivo: Dict[str, int] = {}
-    arquivos_txt: List[str] = []
+    registros: List[Dict[str, Any]] = []
+    for i, line in enumerate(pular_cabecalho_rodape(linhas), start=3):
+        if i % 2 != 0 and _linha_aceita(line):
+            for nome in _REGEX_NOME.findall(line):
+                registros.append({"nome": nome, "cpf": None, "valor": None})
+    return registros
+
+
+def _parse_ret_file_seguro(file_path: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """parse_ret_file devolvendo (registros, erro); roda no processo do pool."""
+    try:
+        return parse_ret_file(file_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
 
-    for arquivo in glob.glob(os.path.join(folder, "*.txt")):
-        arquivos_txt.append(arquivo)
 
-    for file_path in arquivos_txt:
+def parse_ret_records(
+    folder: str,
+    max_workers: int = 1,
+    erros: Optional[List[Tuple[str, str]]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Lê os .ret/.txt da pasta (sem renomear) e retorna:
+    - registros {nome, cpf, valor, arquivo} na ordem dos arquivos
+    - nomes_por_arquivo (dict filename -> count)
+
+    Com max_workers > 1 os arquivos são lidos em um pool de processos; os
+    resultados são juntados na ordem dos arquivos, então a saída é a mesma do
+    modo serial. Arquivos que falham entram em `erros` como (arquivo, erro).
+    """
+    arquivos = listar_arquivos_retorno(folder)
+    if max_workers > 1 and len(arquivos) > 1:
+        # Muitos arquivos pequenos: lotes por processo reduzem o custo de IPC
+        lote = max(1, len(arquivos) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            resultados = list(executor.map(_parse_ret_file_seguro, arquivos, chunksize=lote))
+    else:
+        resultados = [_parse_ret_file_seguro(arquivo) for arquivo in arquivos]
+
+    registros_total: List[Dict[str, Any]] = []
+    nomes_por_arquivo: Dict[str, int] = {}
+    for file_path, (registros, erro) in zip(arquivos, resultados):
         nome_arquivo = os.path.basename(file_path)
-        nomes_encontrados_arquivo = 0
-        try:
-            with open(file_path, "r", encoding="latin-1") as f:
-                linhas = f.readlines()[2:-2]
-                for i, line in enumerate(linhas, start=3):
-                    if i % 2 != 0 and palavra_excluida not in line and not regex_excluir.search(line):
-                        nomes = regex_nome.findall(line)
-                        nomes_encontrados_total.extend(nomes)
-                        nomes_encontrados_arquivo += len(nomes)
-        except Exception as e:
-            print(f"Erro ao processar o arquivo {nome_arquivo}: {e}")
+        if erro is not None:
+            if erros is not None:
+                erros.append((nome_arquivo, erro))
+            else:
+                print(f"Erro ao processar o arquivo {nome_arquivo}: {erro}")
             continue
-        nomes_por_arquivo[nome_arquivo] = nomes_encontrados_arquivo
+        for registro in registros:
+            registro["arquivo"] = nome_arquivo
+        registros_total.extend(registros)
+        nomes_por_arquivo[nome_arquivo] = len(registros)
+    return registros_total, nomes_por_arquivo
+
+
+def parse_ret_txt_files(
+    folder: str,
+    max_workers: int = 1,
+    erros: Optional[List[Tuple[str, str]]] = None,
+) -> Tuple[List[str], int, Dict[str, int]]:
+    """Lê os .ret/.txt da pasta (sem renomear), filtra linhas, extrai nomes e retorna:
+    - nomes_encontrados (lista)
+    - total_nomes_encontrados (int)
+    - nomes_por_arquivo (dict filename -> count)
 
+    Ver parse_ret_records para `max_workers` e `erros`.
+    """
+    registros, nomes_por_arquivo = parse_ret_records(folder, max_workers, erros)
+    nomes_encontrados_total = [r["nome"] for r in registros]
     total_nomes = sum(nomes_por_arquivo.values())
     return nomes_encontrados_total, total_nomes, nomes_por_arquivo
 
 
 def buscar_no_banco(
-    nomes_encontrados: List[str], banco_json_path: str, incluir_valores: bool
+    nomes_encontrados: List[str],
+    banco_json_path: str,
+    incluir_valores: bool,
+    cpfs: Optional[List[Optional[str]]] = None,
 ) -> Tuple[List[Dict[str, Any]], float, Dict[str, Dict[str, List[Tuple[str, Optional[str], Optional[str], str]]]]]:
     """Busca nomes no banco JSON e constrói resultados agregados por arquivo de origem.
+
+    `cpfs`, quando informado, tem o CPF de cada ocorrência (ou None), na mesma
+    ordem de `nomes_encontrados`. Ocorrências com CPF presente no banco são
+    casadas direto pelo índice de CPF; as demais seguem pelas heurísticas de
+    nome (exata, prefixo e tokens).
     Retorna:
     - all_results (linhas para CSV)
     - total_valores_encontrados (float)
     - resultados_por_arquivo (para sa��da .txt organizada)
     """
-    dados_banco = load_data_from_json(banco_json_path)
     total_valores_encontrados = 0.0
     resultados_por_arquivo: Dict[str, Dict[str, List[Tuple[str, Optional[str], Optional[str], str]]]] = {}
     all_results: List[Dict[str, Any]] = []
 
-    # Index auxiliar: nome -> lista de (arquivo, dado)
-    index: Dict[str, List[Tuple[str, Any]]] = {}
-    for nome_arquivo_db, dados in dados_banco.items():
-        for nome, raw in dados.items():
-            index.setdefault(nome, []).append((nome_arquivo_db, raw))
+    # Consultas exatas e por prefixo vão para o banco (índices do SQLite ou
+    # índice em memória do JSON legado)
+    banco = open_database(banco_json_path)
+    indice_tokens: Optional[TokenIndex] = None
 
-    for nome_original in nomes_encontrados:
+    def resolver(nome_original: str) -> Tuple[str, Optional[str], Optional[str], str, float]:
+        """Resolve um nome: (origem, cpf, valor formatado, status, valor somado ao total)."""
+        nonlocal indice_tokens
         pdf_origem: Optional[str] = None
-        nome_encontrado: Optional[str] = None
         valor_encontrado: Optional[float] = None
         cpf_encontrado: Optional[str] = None
 
         # Busca direta
-        if nome_original in index:
-            for nome_arquivo_db, raw in index[nome_original]:
-                pdf_origem = nome_arquivo_db
-                nome_encontrado = nome_original
+        ocorrencias = banco.exact(nome_original)
+        if ocorrencias:
+            pdf_origem, raw = ocorrencias[0]
+            if isinstance(raw, dict):
+                valor_encontrado = raw.get("valor")
+                cpf_encontrado = raw.get("cpf")
+            else:
+                valor_encontrado = raw
+                cpf_encontrado = None
+
+            chave_saida = pdf_origem.split(" - ")[0].replace("  ", " ") if pdf_origem else "Desconhecido"
+            if incluir_valores:
+                formatted_valor = (
+                    format_currency(valor_encontrado) if isinstance(valor_encontrado, (int, float)) else None
+                )
+                soma = valor_encontrado if isinstance(valor_encontrado, (int, float)) else 0.0
+                return chave_saida, cpf_encontrado, formatted_valor, "Completo", soma
+            return chave_saida, cpf_encontrado, None, "Completo", 0.0
+
+        # Busca parcial por prefixos acumulados
+        partes = nome_original.split()
+        for i in range(1, len(partes) + 1):
+            nome_parcial = " ".join(partes[:i])
+            # Só interessa saber se há exatamente uma correspondência
+            correspondencias = banco.prefix(nome_parcial, limit=2)
+            if len(correspondencias) == 1:
+                nome_encontrado, pdf_origem, raw = correspondencias[0]
                 if isinstance(raw, dict):
                     valor_encontrado = raw.get("valor")
                     cpf_encontrado = raw.get("cpf")
                 else:
                     valor_encontrado = raw
                     cpf_encontrado = None
-                break
 
-            if nome_encontrado:
                 chave_saida = pdf_origem.split(" - ")[0].replace("  ", " ") if pdf_origem else "Desconhecido"
-                resultados_por_arquivo.setdefault(chave_saida, [])
-                if incluir_valores:
+                status = f"Parcial - Encontrado como: {nome_encontrado}"
+                if incluir_valores and valor_encontrado is not None:
                     formatted_valor = (
                         format_currency(valor_encontrado) if isinstance(valor_encontrado, (int, float)) else None
                     )
-                    resultados_por_arquivo[chave_saida].append((nome_original, cpf_encontrado, formatted_valor, "Completo"))
-                    if isinstance(valor_encontrado, (int, float)):
-                        total_valores_encontrados += valor_encontrado
-                else:
-                    resultados_por_arquivo[chave_saida].append((nome_original, cpf_encontrado, None, "Completo"))
-        else:
-            # Busca parcial por prefixos acumulados
-            partes = nome_original.split()
-            encontrado = False
-            for i in range(1, len(partes) + 1):
-                nome_parcial = " ".join(partes[:i])
-                correspondencias = [
-                    (nome, nome_arquivo_db, dados_banco[nome_arquivo_db][nome])
-                    for nome_arquivo_db in dados_banco
-                    for nome in dados_banco[nome_arquivo_db]
-                    if nome.startswith(nome_parcial)
-                ]
-                if len(correspondencias) == 1:
-                    nome_encontrado = correspondencias[0][0]
-                    pdf_origem = correspondencias[0][1]
-                    raw = correspondencias[0][2]
-                    if isinstance(raw, dict):
-                        valor_encontrado = raw.get("valor")
-                        cpf_encontrado = raw.get("cpf")
-                    else:
-                        valor_encontrado = raw
-                        cpf_encontrado = None
-
-                    chave_saida = pdf_origem.split(" - ")[0].replace("  ", " ") if pdf_origem else "Desconhecido"
-                    resultados_por_arquivo.setdefault(chave_saida, [])
-
-                    if incluir_valores and valor_encontrado is not None:
-                        formatted_valor = (
-                            format_currency(valor_encontrado) if isinstance(valor_encontrado, (int, float)) else None
-                        )
-                        resultados_por_arquivo[chave_saida].append(
-                            (nome_original, cpf_encontrado, formatted_valor, f"Parcial - Encontrado como: {nome_encontrado}")
-                        )
-                        if isinstance(valor_encontrado, (int, float)):
-                            total_valores_encontrados += valor_encontrado
-                    else:
-                        resultados_por_arquivo[chave_saida].append(
-                            (nome_original, cpf_encontrado, None, f"Parcial - Encontrado como: {nome_encontrado}")
-                        )
-                    encontrado = True
-                    break
-            if not encontrado:
-                resultados_por_arquivo.setdefault("Não Encontrado", [])
-                tokens = [t.lower() for t in nome_original.split() if len(t) > 2]
-                candidates: List[Tuple[str, str, Any]] = []
-                for nome_db_file, dados in dados_banco.items():
-                    for nome_db, raw in dados.items():
-                        nome_db_low = nome_db.lower()
-                        if tokens and all(tok in nome_db_low for tok in tokens):
-                            candidates.append((nome_db, nome_db_file, raw))
-
-                if len(candidates) == 1:
-                    cand_nome, cand_file, raw = candidates[0]
-                    cpf_cand = raw.get("cpf") if isinstance(raw, dict) else None
-                    val_cand = raw.get("valor") if isinstance(raw, dict) else raw
-                    status_text = f"Tentativa - Encontrado como: {cand_nome}"
-                    formatted_val = format_currency(val_cand) if isinstance(val_cand, (int, float)) else None
-                    resultados_por_arquivo["Não Encontrado"].append((nome_original, cpf_cand, formatted_val, status_text))
-                    if isinstance(val_cand, (int, float)):
-                        total_valores_encontrados += val_cand
-                else:
-                    resultados_por_arquivo["Não Encontrado"].append((nome_original, None, None, "Não encontrado"))
+                    soma = valor_encontrado if isinstance(valor_encontrado, (int, float)) else 0.0
+                    return chave_saida, cpf_encontrado, formatted_valor, status, soma
+                return chave_saida, cpf_encontrado, None, status, 0.0
+
+        tokens = [t.lower() for t in nome_original.split() if len(t) > 2]
+        candidates: List[Tuple[str, str, Any]] = []
+        if tokens:
+            # Índice construído uma vez por execução, só se necessário
+            if indice_tokens is None:
+                indice_tokens = TokenIndex(banco.all_records())
+            # Só interessa saber se há exatamente um candidato
+            candidates = indice_tokens.search(tokens, limit=2)
+
+        if len(candidates) == 1:
+            cand_nome, cand_file, raw = candidates[0]
+            cpf_cand = raw.get("cpf") if isinstance(raw, dict) else None
+            val_cand = raw.get("valor") if isinstance(raw, dict) else raw
+            status_text = f"Tentativa - Encontrado como: {cand_nome}"
+            formatted_val = format_currency(val_cand) if isinstance(val_cand, (int, float)) else None
+            soma = val_cand if isinstance(val_cand, (int, float)) else 0.0
+            return "Não Encontrado", cpf_cand, formatted_val, status_text, soma
+        return "Não Encontrado", None, None, "Não encontrado", 0.0
+
+    def resolver_por_cpf(
+        nome_original: str, cpf: str
+    ) -> Optional[Tuple[str, Optional[str], Optional[str], str, float]]:
+        ocorrencias = banco.by_cpf(cpf)
+        if not ocorrencias:
+            return None
+        nome_db, pdf_origem, raw = ocorrencias[0]
+        valor_encontrado = raw.get("valor") if isinstance(raw, dict) else raw
+        cpf_encontrado = raw.get("cpf") if isinstance(raw, dict) else None
+        chave_saida = pdf_origem.split(" - ")[0].replace("  ", " ") if pdf_origem else "Desconhecido"
+        status = "Completo" if nome_db == nome_original else f"CPF - Encontrado como: {nome_db}"
+        if incluir_valores and isinstance(valor_encontrado, (int, float)):
+            return chave_saida, cpf_encontrado, format_currency(valor_encontrado), status, valor_encontrado
+        return chave_saida, cpf_encontrado, None, status, 0.0
+
+    # O mesmo nome aparece em muitos arquivos de retorno: cada nome (e CPF)
+    # distinto é resolvido uma vez e o resultado é repetido para cada ocorrência.
+    resolvidos: Dict[Tuple[str, Optional[str]], Tuple[str, Optional[str], Optional[str], str, float]] = {}
+    try:
+        for i, nome_original in enumerate(nomes_encontrados):
+            cpf = normalize_cpf(cpfs[i]) if cpfs is not None else None
+            chave = (nome_original, cpf)
+            resolucao = resolvidos.get(chave)
+            if resolucao is None:
+                if cpf is not None:
+                    resolucao = resolver_por_cpf(nome_original, cpf)
+                if resolucao is None:
+                    resolucao = resolver(nome_original)
+                resolvidos[chave] = resolucao
+            chave_saida, cpf, valor, status, soma = resolucao
+            resultados_por_arquivo.setdefault(chave_saida, []).append((nome_original, cpf, valor, status))
+            total_valores_encontrados += soma
+    finally:
+        banco.close()
 
     # Flatten para CSV e remover duplicatas
     processed = set()
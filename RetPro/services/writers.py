@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import csv
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.formatting import format_currency
+
+
+def write_csv(
+    arquivo_saida: str,
+    all_results: List[Dict[str, Any]],
+    total_valores: float,
+    total_nomes: int,
+    incluir_valores: bool,
+) -> None:
+    """CSV com cabeçalho, uma linha por resultado e os totais ao final."""
+    with open(arquivo_saida, "w", newline="", encoding="utf-8") as csvfile:
+        fieldnames = ["Origem", "Nome", "CPF", "Valor", "Status"]
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=";", quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(all_results)
+    if incluir_valores:
+        total_texto = f"Total de nomes encontrados: {total_nomes}\nValor total : {format_currency(total_valores)}"
+    else:
+        total_texto = f"Total de nomes encontrados: {total_nomes}\nOBS: Opção sem valor total"
+    with open(arquivo_saida, "a", encoding="utf-8") as f:
+        f.write(f"\n{total_texto}")
+
+
+def write_txt(
+    arquivo_saida: str,
+    resultados_por_arquivo: Dict[str, List[Tuple[str, Optional[str], Optional[str], str]]],
+    total_valores: float,
+    total_nomes: int,
+    incluir_valores: bool,
+) -> None:
+    """TXT agrupado por PDF de origem, com os totais ao final."""
+    with open(arquivo_saida, "w", encoding="latin-1") as saida:
+        for origem, registros in resultados_por_arquivo.items():
+            saida.write(f"{origem}:\n")
+            for nome, cpf, valor, status in registros:
+                if incluir_valores:
+                    saida.write(f"- {nome} - CPF: {cpf if cpf else 'N/A'} - {valor}\n    - {status}\n")
+                else:
+                    saida.write(f"- {nome}\n    - {status}\n")
+            saida.write("\n")
+        saida.write(f"\nTotal de nomes encontrados: {total_nomes}\n")
+        if incluir_valores:
+            saida.write(f"Valor total : {format_currency(total_valores)}")
+        else:
+            saida.write("OBS: Opção sem valor total")
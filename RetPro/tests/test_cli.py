@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services import pdf_extraction  # noqa: E402
+
+fitz = pdf_extraction.fitz
+
+
+class TestCli(unittest.TestCase):
+    def _executar(self, *args):
+        return subprocess.run(
+            [sys.executable, os.path.join(PROJECT_DIR, "app.py"), *args],
+            capture_output=True, text=True, cwd=PROJECT_DIR,
+        )
+
+    @unittest.skipIf(fitz is None, "PyMuPDF não instalado")
+    def test_execucao_sem_interface(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pasta_ret = os.path.join(tmpdir, "ret")
+            pasta_pdf = os.path.join(tmpdir, "pdf")
+            os.makedirs(pasta_ret)
+            os.makedirs(pasta_pdf)
+            with open(os.path.join(pasta_ret, "a.ret"), "w", encoding="latin-1") as f:
+                f.write("h1\nh2\nJOAO SILVA\nXX\nMARIA JOSE\nYY\nf1\nf2\n")
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_text((50, 80), "001 - JOAO SILVA  123.456.789-10  ANALISTA  100,00", fontsize=8)
+            doc.save(os.path.join(pasta_pdf, "001 - folha.pdf"))
+            doc.close()
+            banco = os.path.join(tmpdir, "banco.sqlite3")
+            saida = os.path.join(tmpdir, "saida.csv")
+
+            proc = self._executar(pasta_ret, pasta_pdf, saida, "--csv", "--banco", banco)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("Banco de dados: 100%", proc.stderr)
+            self.assertIn("Total de nomes encontrados: 2", proc.stderr)
+            with open(saida, encoding="utf-8") as f:
+                conteudo = f.read()
+            self.assertIn('"001";"JOAO SILVA";"123.456.789-10"', conteudo)
+            self.assertIn('"Não Encontrado";"MARIA JOSE"', conteudo)
+
+    def test_pasta_inexistente(self):
+        proc = self._executar("/nao/existe", "/nao/existe", "saida.txt")
+        self.assertEqual(proc.returncode, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.cnab import is_cnab240, parse_cnab240  # noqa: E402
+from services.ret_processing import parse_ret_file, parse_ret_txt_files  # noqa: E402
+
+
+def _linha(campos):
+    """Monta uma linha de 240 colunas a partir de {posição inicial 1-based: texto}."""
+    linha = [" "] * 240
+    for inicio, texto in campos.items():
+        linha[inicio - 1:inicio - 1 + len(texto)] = texto
+    return "".join(linha) + "\n"
+
+
+def _segmento_a(nome, centavos, ocorrencia="00"):
+    return _linha({1: "00100013", 14: "A", 44: nome.ljust(30), 120: str(centavos).zfill(15), 231: ocorrencia})
+
+
+def _segmento_b(cpf_digitos, tipo="1"):
+    return _linha({1: "00100013", 14: "B", 18: tipo, 19: cpf_digitos.zfill(14)})
+
+
+def _retorno(detalhes):
+    return (
+        [_linha({1: "00100000", 143: "2"}), _linha({1: "00100011"})]
+        + detalhes
+        + [_linha({1: "00100015"}), _linha({1: "00199999"})]
+    )
+
+
+class TestCnab240(unittest.TestCase):
+    def test_segmentos_a_e_b(self):
+        linhas = _retorno([
+            _segmento_a("JOAO DA SILVA", 123456),
+            _segmento_b("12345678910"),
+            _segmento_a("EMPRESA X", 1000),
+            _segmento_b("12345678000199", tipo="2"),
+        ])
+        self.assertTrue(is_cnab240(linhas[0]))
+        registros = parse_cnab240(linhas)
+        self.assertEqual(registros, [
+            {"nome": "JOAO DA SILVA", "cpf": "123.456.789-10", "valor": 1234.56},
+            {"nome": "EMPRESA X", "cpf": None, "valor": 10.0},
+        ])
+
+    def test_filtros_de_ocorrencia(self):
+        linhas = _retorno([
+            _segmento_a("JOAO DA SILVA", 100, ocorrencia="00"),
+            _segmento_b("11111111111"),
+            _segmento_a("MARIA AGENDADA", 200, ocorrencia="0BD"),
+            _segmento_b("22222222222"),
+        ])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "retorno.txt")
+            with open(path, "w", encoding="latin-1") as f:
+                f.writelines(linhas)
+            registros = parse_ret_file(path)
+            nomes, total, por_arq = parse_ret_txt_files(tmpdir)
+        self.assertEqual([r["nome"] for r in registros], ["JOAO DA SILVA"])
+        self.assertEqual(registros[0]["cpf"], "111.111.111-11")
+        self.assertEqual(nomes, ["JOAO DA SILVA"])
+        self.assertEqual(por_arq, {"retorno.txt": 1})
+
+    def test_arquivo_fora_do_layout_usa_regex(self):
+        self.assertFalse(is_cnab240("header1\n"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.txt")
+            with open(path, "w", encoding="latin-1") as f:
+                f.write("header1\nheader2\nJOAO SILVA\nXX\nfooter1\nfooter2\n")
+            self.assertEqual(parse_ret_file(path), [{"nome": "JOAO SILVA", "cpf": None, "valor": None}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.db import (  # noqa: E402
+    MemoryDatabase,
+    SQLiteDatabase,
+    export_sqlite_to_json,
+    import_json_to_sqlite,
+    load_data_from_json,
+    save_data_to_json,
+)
+from services.ret_processing import buscar_no_banco  # noqa: E402
+
+BANCO = {
+    "001 - folha.pdf": {
+        "JOAO SILVA": {"cpf": "123.456.789-10", "valor": 100.0},
+        "MARIA JOSE": {"cpf": "111.222.333-44", "valor": 200.0},
+    },
+    "002 - folha.pdf": {
+        "JOAO SILVA": {"cpf": "123.456.789-10", "valor": 150.0},
+        "PEDRO ALVES SOUZA": {"cpf": "555.666.777-88", "valor": 50.0},
+    },
+}
+
+
+class TestSQLiteDatabase(unittest.TestCase):
+    def test_consultas(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SQLiteDatabase(os.path.join(tmpdir, "db.sqlite3")) as db:
+                db.import_dict(BANCO)
+                self.assertEqual([a for a, _ in db.exact("JOAO SILVA")], ["001 - folha.pdf", "002 - folha.pdf"])
+                self.assertEqual([n for n, _, _ in db.prefix("JOAO")], ["JOAO SILVA", "JOAO SILVA"])
+                self.assertEqual([n for n, _, _ in db.prefix("PEDRO", limit=2)], ["PEDRO ALVES SOUZA"])
+                self.assertEqual(db.prefix("ZZZ"), [])
+                self.assertEqual([a for _, a, _ in db.by_cpf("555.666.777-88")], ["002 - folha.pdf"])
+
+    def test_importar_exportar_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_in = os.path.join(tmpdir, "in.json")
+            json_out = os.path.join(tmpdir, "out.json")
+            sqlite_path = os.path.join(tmpdir, "db.sqlite3")
+            save_data_to_json(BANCO, json_in)
+            import_json_to_sqlite(json_in, sqlite_path)
+            export_sqlite_to_json(sqlite_path, json_out)
+            self.assertEqual(load_data_from_json(json_out), BANCO)
+
+    def test_prefixo_memoria_igual_sqlite(self):
+        memoria = MemoryDatabase(BANCO)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SQLiteDatabase(os.path.join(tmpdir, "db.sqlite3")) as db:
+                db.import_dict(BANCO)
+                for prefixo in ["J", "JOAO", "JOAO SILVA", "M", "P", "PEDRO ALVES", "X", "JOAO SILVAX"]:
+                    self.assertEqual(memoria.prefix(prefixo), db.prefix(prefixo))
+                    self.assertEqual(memoria.prefix(prefixo, limit=2), db.prefix(prefixo, limit=2))
+
+    def test_buscar_no_banco_sqlite_igual_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, "db.json")
+            sqlite_path = os.path.join(tmpdir, "db.sqlite3")
+            save_data_to_json(BANCO, json_path)
+            import_json_to_sqlite(json_path, sqlite_path)
+            nomes = ["JOAO SILVA", "MARIA", "PEDRO", "JOAO", "ALVES SOUZA", "DESCONHECIDO"]
+            self.assertEqual(
+                buscar_no_banco(nomes, sqlite_path, incluir_valores=True),
+                buscar_no_banco(nomes, json_path, incluir_valores=True),
+            )
+
+    def test_cpf_memoria_igual_sqlite(self):
+        memoria = MemoryDatabase(BANCO)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SQLiteDatabase(os.path.join(tmpdir, "db.sqlite3")) as db:
+                db.import_dict(BANCO)
+                for cpf in ["123.456.789-10", "12345678910", "00012345678910", "555.666.777-88", "999", "", "abc"]:
+                    self.assertEqual(memoria.by_cpf(cpf), db.by_cpf(cpf))
+                self.assertEqual([a for _, a, _ in db.by_cpf("12345678910")], ["001 - folha.pdf", "002 - folha.pdf"])
+
+    def test_buscar_no_banco_por_cpf(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sqlite_path = os.path.join(tmpdir, "db.sqlite3")
+            with SQLiteDatabase(sqlite_path) as db:
+                db.import_dict(BANCO)
+            # Nome truncado no retorno, mas com CPF; sem CPF segue pelo nome
+            nomes = ["PEDRO A SOUZA", "MARIA JOSE", "JOAO SILVA"]
+            cpfs = ["55566677788", None, "999.999.999-99"]
+            _, total, por_arquivo = buscar_no_banco(nomes, sqlite_path, True, cpfs)
+        self.assertEqual(por_arquivo["002"][0][0], "PEDRO A SOUZA")
+        self.assertEqual(por_arquivo["002"][0][3], "CPF - Encontrado como: PEDRO ALVES SOUZA")
+        self.assertEqual([r[0] for r in por_arquivo["001"]], ["MARIA JOSE", "JOAO SILVA"])
+        self.assertAlmostEqual(total, 350.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
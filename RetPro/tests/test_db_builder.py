@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.db import SQLiteDatabase  # noqa: E402
+from services.db_builder import build_database_incremental  # noqa: E402
+
+
+def _fake_extract(pdf_path, backend=None):
+    with open(pdf_path, "r", encoding="utf-8") as f:
+        nome = f.read().strip()
+    return {nome: {"cpf": "000.000.000-00", "valor": 1.0}}
+
+
+class TestDbBuilder(unittest.TestCase):
+    def test_reextrai_somente_novos_ou_alterados(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pasta_pdf = os.path.join(tmpdir, "pdfs")
+            os.makedirs(pasta_pdf)
+            banco_path = os.path.join(tmpdir, "banco.sqlite3")
+
+            def escrever(nome, conteudo):
+                with open(os.path.join(pasta_pdf, nome), "w", encoding="utf-8") as f:
+                    f.write(conteudo)
+
+            escrever("a.pdf", "JOAO")
+            escrever("b.pdf", "MARIA")
+
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path)
+                self.assertEqual(mock_extract.call_count, 2)
+
+            # Nada mudou: nenhuma extração
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path)
+                self.assertEqual(mock_extract.call_count, 0)
+
+            # b alterado, a removido, c novo
+            escrever("b.pdf", "MARIA JOSE")
+            os.remove(os.path.join(pasta_pdf, "a.pdf"))
+            escrever("c.pdf", "PEDRO")
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path)
+                extraidos = sorted(os.path.basename(c.args[0]) for c in mock_extract.call_args_list)
+                self.assertEqual(extraidos, ["b.pdf", "c.pdf"])
+
+            with SQLiteDatabase(banco_path) as db:
+                banco = db.to_dict()
+            self.assertEqual(set(banco), {"b.pdf", "c.pdf"})
+            self.assertIn("MARIA JOSE", banco["b.pdf"])
+
+    def test_reextrai_quando_backend_muda(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pasta_pdf = os.path.join(tmpdir, "pdfs")
+            os.makedirs(pasta_pdf)
+            with open(os.path.join(pasta_pdf, "a.pdf"), "w", encoding="utf-8") as f:
+                f.write("JOAO")
+            banco_path = os.path.join(tmpdir, "banco.sqlite3")
+
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path, backend="pypdf2")
+                build_database_incremental(pasta_pdf, banco_path, backend="pypdf2")
+                self.assertEqual(mock_extract.call_count, 1)
+
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path, backend="pymupdf")
+                self.assertEqual(mock_extract.call_count, 1)
+                self.assertEqual(mock_extract.call_args.args[1], "pymupdf")
+
+            with SQLiteDatabase(banco_path) as db:
+                self.assertEqual(db.fingerprints()["a.pdf"]["backend"], "pymupdf")
+
+    def test_banco_sem_coluna_backend_e_reextraido(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pasta_pdf = os.path.join(tmpdir, "pdfs")
+            os.makedirs(pasta_pdf)
+            pdf_path = os.path.join(pasta_pdf, "a.pdf")
+            with open(pdf_path, "w", encoding="utf-8") as f:
+                f.write("JOAO")
+            st = os.stat(pdf_path)
+            banco_path = os.path.join(tmpdir, "banco.sqlite3")
+            # Banco no formato anterior, sem a coluna backend
+            con = sqlite3.connect(banco_path)
+            con.execute(
+                "CREATE TABLE arquivos (arquivo TEXT PRIMARY KEY, ordem INTEGER NOT NULL DEFAULT 0,"
+                " size INTEGER, mtime_ns INTEGER, sha256 TEXT)"
+            )
+            con.execute(
+                "INSERT INTO arquivos VALUES (?, 0, ?, ?, NULL)", ("a.pdf", st.st_size, st.st_mtime_ns)
+            )
+            con.commit()
+            con.close()
+
+            with patch("services.db_builder.read_data", side_effect=_fake_extract) as mock_extract:
+                build_database_incremental(pasta_pdf, banco_path)
+                self.assertEqual(mock_extract.call_count, 1)
+            with SQLiteDatabase(banco_path) as db:
+                self.assertIn("JOAO", db.to_dict()["a.pdf"])
+
+    def test_falha_reportada_sem_interromper(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pasta_pdf = os.path.join(tmpdir, "pdfs")
+            os.makedirs(pasta_pdf)
+            for nome, conteudo in [("a.pdf", "JOAO"), ("b.pdf", "MARIA")]:
+                with open(os.path.join(pasta_pdf, nome), "w", encoding="utf-8") as f:
+                    f.write(conteudo)
+            banco_path = os.path.join(tmpdir, "banco.sqlite3")
+
+            def extrair(pdf_path, backend=None):
+                if pdf_path.endswith("a.pdf"):
+                    raise ValueError("PDF corrompido")
+                return _fake_extract(pdf_path)
+
+            progresso = []
+            with patch("services.db_builder.read_data", side_effect=extrair):
+                falhas = build_database_incremental(pasta_pdf, banco_path, progresso.append)
+            self.assertEqual([f for f, _ in falhas], ["a.pdf"])
+            self.assertEqual(progresso[-1], 100)
+            with SQLiteDatabase(banco_path) as db:
+                self.assertEqual(set(db.to_dict()), {"b.pdf"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+import unittest
+
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from services.name_index import TokenIndex  # noqa: E402
+
+
+class TestTokenIndex(unittest.TestCase):
+    def test_igual_a_varredura(self):
+        rnd = random.Random(3)
+        partes = ["JOAO", "SILVA", "SILVANA", "MARIA", "JOSE", "JOSEFA", "ANA", "LIMA", "ALIMA", "SOUZA"]
+        registros = [
+            (" ".join(rnd.choice(partes) for _ in range(rnd.randint(1, 4))), f"arq{i % 3}.pdf", {"valor": i})
+            for i in range(300)
+        ]
+        indice = TokenIndex(registros)
+        for _ in range(200):
+            tokens = [t.lower() for t in rnd.sample(partes + ["SIL", "OSE", "XYZ"], rnd.randint(1, 3))]
+            esperado = [r for r in registros if all(tok in r[0].lower() for tok in tokens)]
+            self.assertEqual(indice.search(tokens), esperado)
+            self.assertEqual(indice.search(tokens, limit=2), esperado[:2])
+
+    def test_sem_tokens(self):
+        self.assertEqual(TokenIndex([("JOAO", "a.pdf", {})]).search([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import os
+import re
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -7,7 +9,9 @@ CURRENT_DIR = os.path.dirname(__file__)
 PROJECT_DIR = os.path.dirname(CURRENT_DIR)
 sys.path.insert(0, PROJECT_DIR)
 
-from services.pdf_extraction import extract_data  # noqa: E402
+from services import pdf_extraction  # noqa: E402
+from constants.regex import PDF_NAME_CPF_VALUE  # noqa: E402
+from services.pdf_extraction import extract_data, iter_matches, read_data  # noqa: E402
 
 
 class TestPdfExtraction(unittest.TestCase):
@@ -20,13 +24,81 @@ class TestPdfExtraction(unittest.TestCase):
         mock_reader.pages = [mock_page]
         mock_reader_cls.return_value = mock_reader
 
-        data = extract_data("fake.pdf")
+        data = extract_data("fake.pdf", backend="pypdf2")
         self.assertIn("JOAO SILVA", data)
         self.assertIn("MARIA", data)
         self.assertEqual(data["JOAO SILVA"]["cpf"], "123.456.789-10")
         self.assertAlmostEqual(data["JOAO SILVA"]["valor"], 1234.56)
         self.assertAlmostEqual(data["MARIA"]["valor"], 2000.00)
 
+    def test_backend_desconhecido(self):
+        with self.assertRaises(ValueError):
+            read_data("fake.pdf", backend="inexistente")
+
+    def test_iter_matches_igual_findall_com_quebras_de_pagina(self):
+        linhas = [
+            f" - SERVIDOR {chr(65 + i % 26)}{chr(65 + i // 26)}  123.456.789-{i % 100:02d} CARGO {i},{i % 100:02d}\n"
+            for i in range(200)
+        ]
+        texto = "".join(linhas)
+        esperado = re.findall(PDF_NAME_CPF_VALUE, texto)
+        # Páginas cortadas em pontos arbitrários, inclusive no meio de registros
+        for tamanho in (7, 50, 333, 1000):
+            paginas = [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+            self.assertEqual(list(iter_matches(paginas, PDF_NAME_CPF_VALUE, window=120)), esperado)
+
+    def test_iter_matches_libera_registros_antes_do_fim(self):
+        consumidas = []
+
+        def paginas():
+            for i in range(5):
+                consumidas.append(i)
+                yield f" - NOME  111.222.333-0{i} X 1,0{i}\n" + " " * 50
+
+        gen = iter_matches(paginas(), PDF_NAME_CPF_VALUE, window=40)
+        primeiro = next(gen)
+        self.assertEqual(primeiro[1], "111.222.333-00")
+        self.assertEqual(consumidas, [0])
+
+
+def _gerar_folha(path):
+    """Gera uma folha de pagamento de exemplo com o PyMuPDF."""
+    fitz = pdf_extraction.fitz
+    doc = fitz.open()
+    for pagina in range(3):
+        page = doc.new_page()
+        page.insert_text((50, 50), "FOLHA DE PAGAMENTO - PREFEITURA", fontsize=10)
+        y = 80
+        for i in range(12):
+            n = pagina * 12 + i
+            letras = chr(ord("A") + n // 26) + chr(ord("A") + n % 26)
+            page.insert_text(
+                (50, y),
+                f"{n:03d} - JOSÉ DA SILVA NÚMERO {letras}  123.456.{n:03d}-{n % 100:02d}   ANALISTA   1.{n:03d},{n % 100:02d}",
+                fontsize=8,
+            )
+            y += 14
+        # Linha de tabela: nome, CPF, cargo e valor em objetos de texto separados
+        page.insert_text((50, y), f"{pagina:03d} - MARIA TABELA {'X' * (pagina + 1)}", fontsize=8)
+        page.insert_text((250, y), f"987.654.321-{pagina:02d}", fontsize=8)
+        page.insert_text((350, y), "PROFESSORA", fontsize=8)
+        page.insert_text((450, y), f"2.50{pagina},00", fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+@unittest.skipIf(pdf_extraction.fitz is None, "PyMuPDF não instalado")
+class TestParidadeBackends(unittest.TestCase):
+    def test_pymupdf_igual_pypdf2(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "folha.pdf")
+            _gerar_folha(path)
+            via_pypdf2 = read_data(path, backend="pypdf2")
+            via_pymupdf = read_data(path, backend="pymupdf")
+        self.assertEqual(len(via_pypdf2), 39)
+        self.assertIn("MARIA TABELA XX", via_pypdf2)
+        self.assertEqual(via_pymupdf, via_pypdf2)
+
 
 if __name__ == "__main__":
     unittest.main()
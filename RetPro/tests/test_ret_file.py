@@ -7,7 +7,7 @@ CURRENT_DIR = os.path.dirname(__file__)
 PROJECT_DIR = os.path.dirname(CURRENT_DIR)
 sys.path.insert(0, PROJECT_DIR)
 
-from utils.ret_file import alterar_extensao_para_txt  # noqa: E402
+from utils.ret_file import alterar_extensao_para_txt, ler_linhas, pular_cabecalho_rodape  # noqa: E402
 
 
 class TestRetFile(unittest.TestCase):
@@ -31,6 +31,30 @@ class TestRetFile(unittest.TestCase):
             self.assertIsNone(result)
             self.assertTrue(os.path.exists(path))
 
+    def test_pular_cabecalho_rodape_igual_fatia(self):
+        for n in range(8):
+            linhas = [f"linha {i}\n" for i in range(n)]
+            self.assertEqual(list(pular_cabecalho_rodape(iter(linhas))), linhas[2:-2])
+
+    def test_ler_linhas_igual_readlines(self):
+        conteudos = [
+            b"",
+            b"sem quebra",
+            b"a\nb\n",
+            b"JOS\xc9 DA SILVA\r\nMARIA\r\n\r\nfim",
+            b"velho\rmac\rfim\r",
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "retorno.txt")
+            for conteudo in conteudos:
+                with open(path, "wb") as f:
+                    f.write(conteudo)
+                with open(path, "r", encoding="latin-1") as f:
+                    esperado = f.readlines()
+                self.assertEqual(list(ler_linhas(path)), esperado)
+                # Força o caminho por mmap
+                self.assertEqual(list(ler_linhas(path, mmap_min_bytes=1)), esperado)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,13 +2,15 @@ import os
 import sys
 import tempfile
 import unittest
+from unittest.mock import patch
 
 CURRENT_DIR = os.path.dirname(__file__)
 PROJECT_DIR = os.path.dirname(CURRENT_DIR)
 sys.path.insert(0, PROJECT_DIR)
 
+from services import ret_processing  # noqa: E402
 from services.ret_processing import parse_ret_txt_files, buscar_no_banco  # noqa: E402
-from services.db import save_data_to_json  # noqa: E402
+from services.db import MemoryDatabase, save_data_to_json  # noqa: E402
 
 
 class TestRetProcessing(unittest.TestCase):
@@ -26,6 +28,49 @@ class TestRetProcessing(unittest.TestCase):
             self.assertTrue({"JOAO SILVA", "MARIA JOSE", "JOSE ALMEIDA"}.issubset(set(nomes)))
             self.assertEqual(total, por_arq["a.txt"] + por_arq["b.txt"])
 
+    def test_parse_ret_sem_renomear(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "a.ret"), "w", encoding="latin-1") as f:
+                f.write("header1\nheader2\nJOAO SILVA\nXX\nfooter1\nfooter2\n")
+            with open(os.path.join(tmpdir, "b.txt"), "w", encoding="latin-1") as f:
+                f.write("header1\nheader2\nJOSE ALMEIDA\nXX\nfooter1\nfooter2\n")
+            with open(os.path.join(tmpdir, "c.pdf"), "w", encoding="latin-1") as f:
+                f.write("header1\nheader2\nIGNORADO\nXX\nfooter1\nfooter2\n")
+
+            for _ in range(2):  # reexecução dá o mesmo resultado
+                nomes, total, por_arq = parse_ret_txt_files(tmpdir)
+                self.assertEqual(nomes, ["JOAO SILVA", "JOSE ALMEIDA"])
+                self.assertEqual(por_arq, {"a.ret": 1, "b.txt": 1})
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["a.ret", "b.txt", "c.pdf"])
+
+    def test_parse_paralelo_igual_serial(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(12):
+                with open(os.path.join(tmpdir, f"r{i:02d}.ret"), "w", encoding="latin-1") as f:
+                    f.write("h1\nh2\n" + "".join(f"NOME {chr(65 + i)} {chr(65 + j)}\nXX\n" for j in range(i + 1)) + "f1\nf2\n")
+            serial = parse_ret_txt_files(tmpdir)
+            paralelo = parse_ret_txt_files(tmpdir, max_workers=3)
+        self.assertEqual(paralelo, serial)
+        self.assertEqual(list(serial[2]), [f"r{i:02d}.ret" for i in range(12)])
+
+    def test_erros_por_arquivo(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for nome in ("a.txt", "b.txt"):
+                with open(os.path.join(tmpdir, nome), "w", encoding="latin-1") as f:
+                    f.write("h1\nh2\nJOAO SILVA\nXX\nf1\nf2\n")
+            original = ret_processing.parse_ret_file
+
+            def falhar_em_a(path):
+                if path.endswith("a.txt"):
+                    raise OSError("arquivo inacessível")
+                return original(path)
+
+            erros = []
+            with patch("services.ret_processing.parse_ret_file", side_effect=falhar_em_a):
+                nomes, total, por_arq = parse_ret_txt_files(tmpdir, erros=erros)
+        self.assertEqual(erros, [("a.txt", "OSError: arquivo inacessível")])
+        self.assertEqual(por_arq, {"b.txt": 1})
+
     def test_buscar_no_banco(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             banco_path = os.path.join(tmpdir, "db.json")
@@ -43,6 +88,21 @@ class TestRetProcessing(unittest.TestCase):
             # Deve conter registros para "Não Encontrado" também
             self.assertIn("Não Encontrado", por_arquivo)
 
+    def test_nome_repetido_resolvido_uma_vez(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            banco_path = os.path.join(tmpdir, "db.json")
+            save_data_to_json(
+                {"arquivo1.pdf": {"JOAO SILVA": {"cpf": "123.456.789-10", "valor": 100.0}}}, banco_path
+            )
+            nomes = ["JOAO SILVA", "DESCONHECIDO", "JOAO SILVA", "JOAO SILVA", "DESCONHECIDO"]
+            with patch.object(MemoryDatabase, "exact", autospec=True, side_effect=MemoryDatabase.exact) as exact:
+                results, total_val, por_arquivo = buscar_no_banco(nomes, banco_path, incluir_valores=True)
+            self.assertEqual(exact.call_count, 2)
+            # Cada ocorrência continua no relatório e no total
+            self.assertEqual(len(por_arquivo["arquivo1.pdf"]), 3)
+            self.assertEqual(len(por_arquivo["Não Encontrado"]), 2)
+            self.assertAlmostEqual(total_val, 300.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
@@ -18,8 +18,11 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QButtonGroup,
     QRadioButton,
+    QSpinBox,
+    QComboBox,
 )
 
+from services.pdf_extraction import BACKENDS, DEFAULT_BACKEND
 from utils.fs import open_folder
 from workers.process_worker import ProcessadorThread
 
@@ -30,6 +33,8 @@ class JanelaPrincipal(QWidget):
         self.setWindowTitle("RetFindErro")
         self.setGeometry(100, 100, 500, 250)
         self._thread: Optional[ProcessadorThread] = None
+        self._erros_pdf: List[Tuple[str, str]] = []
+        self._erros_ret: List[Tuple[str, str]] = []
         self._init_ui()
 
     def _init_ui(self) -> None:
@@ -87,6 +92,24 @@ class JanelaPrincipal(QWidget):
         self.checkbox_valores.setChecked(True)
         layout.addWidget(self.checkbox_valores)
 
+        # Processos para leitura dos PDFs e dos arquivos de retorno
+        processos_layout = QHBoxLayout()
+        self.processos_label = QLabel("Processos para leitura (PDFs e retornos):")
+        self.processos_spin = QSpinBox(self)
+        self.processos_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.processos_spin.setValue(1)
+        processos_layout.addWidget(self.processos_label)
+        processos_layout.addWidget(self.processos_spin)
+        # Biblioteca de leitura dos PDFs
+        self.backend_label = QLabel("Leitor de PDF:")
+        self.backend_combo = QComboBox(self)
+        self.backend_combo.addItems(list(BACKENDS))
+        self.backend_combo.setCurrentText(DEFAULT_BACKEND)
+        processos_layout.addWidget(self.backend_label)
+        processos_layout.addWidget(self.backend_combo)
+        processos_layout.addStretch()
+        layout.addLayout(processos_layout)
+
         # Progresso
         self.progress_bar = QProgressBar(self)
         layout.addWidget(self.progress_bar)
@@ -134,8 +157,15 @@ class JanelaPrincipal(QWidget):
             QMessageBox.critical(self, "Erro", "Por favor, selecione a pasta de origem, arquivo de saída e pasta PDF")
             return
 
-        self._thread = ProcessadorThread(pasta_txt, arquivo_saida, pasta_pdf, incluir_valores, saida_csv)
+        self._erros_pdf = []
+        self._erros_ret = []
+        self._thread = ProcessadorThread(
+            pasta_txt, arquivo_saida, pasta_pdf, incluir_valores, saida_csv,
+            self.processos_spin.value(), self.backend_combo.currentText(),
+        )
         self._thread.progresso.connect(self.atualizar_barra_progresso)
+        self._thread.erro_pdf.connect(self.registrar_erro_pdf)
+        self._thread.erro_ret.connect(self.registrar_erro_ret)
         self._thread.concluido.connect(self.finalizar_processamento)
         self._thread.start()
         self.iniciar_button.setEnabled(False)
@@ -143,7 +173,19 @@ class JanelaPrincipal(QWidget):
     def atualizar_barra_progresso(self, progresso: int) -> None:
         self.progress_bar.setValue(progresso)
 
+    def registrar_erro_pdf(self, nome_pdf: str, erro: str) -> None:
+        self._erros_pdf.append((nome_pdf, erro))
+
+    def registrar_erro_ret(self, nome_ret: str, erro: str) -> None:
+        self._erros_ret.append((nome_ret, erro))
+
     def finalizar_processamento(self) -> None:
+        if self._erros_pdf:
+            detalhes = "\n".join(f"- {nome}: {erro}" for nome, erro in self._erros_pdf)
+            QMessageBox.warning(self, "Atenção", f"Alguns PDFs não puderam ser lidos:\n{detalhes}")
+        if self._erros_ret:
+            detalhes = "\n".join(f"- {nome}: {erro}" for nome, erro in self._erros_ret)
+            QMessageBox.warning(self, "Atenção", f"Alguns arquivos de retorno não puderam ser lidos:\n{detalhes}")
         resposta = QMessageBox.question(self, "Processamento Concluído", "Processamento concluído! Deseja fazer outra execução?", QMessageBox.Yes | QMessageBox.No)
         if resposta == QMessageBox.No:
             output_file_path = self.arquivo_input.text()
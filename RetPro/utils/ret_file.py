@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import mmap
 import os
-from typing import Optional
+from collections import deque
+from typing import Iterable, Iterator, List, Optional
+
+# Extensões aceitas como arquivo de retorno (lidos no lugar, sem renomear)
+EXTENSOES_RETORNO = (".ret", ".txt")
+
+# A partir deste tamanho o arquivo é lido por mmap em vez de leitura bufferizada
+MMAP_MIN_BYTES = 64 * 1024 * 1024
 
 
 def alterar_extensao_para_txt(arquivo_ret: str) -> Optional[str]:
@@ -11,3 +19,55 @@ def alterar_extensao_para_txt(arquivo_ret: str) -> Optional[str]:
         os.rename(arquivo_ret, arquivo_txt)
         return arquivo_txt
     return None
+
+
+def listar_arquivos_retorno(pasta: str) -> List[str]:
+    """Caminhos dos arquivos .ret/.txt da pasta, em ordem de nome."""
+    return [
+        os.path.join(pasta, f)
+        for f in sorted(os.listdir(pasta))
+        if f.lower().endswith(EXTENSOES_RETORNO) and os.path.isfile(os.path.join(pasta, f))
+    ]
+
+
+def _linhas_mmap(path: str, encoding: str) -> Iterator[str]:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for bruta in iter(mm.readline, b""):
+            linha = bruta.decode(encoding)
+            if "\r" not in linha:
+                yield linha
+                continue
+            # Mesmas quebras que o modo texto (\r\n e \r viram \n)
+            partes = linha.replace("\r\n", "\n").split("\r")
+            for parte in partes[:-1]:
+                yield parte + "\n"
+            if partes[-1]:
+                yield partes[-1]
+
+
+def ler_linhas(path: str, encoding: str = "latin-1", mmap_min_bytes: int = MMAP_MIN_BYTES) -> Iterator[str]:
+    """Gera as linhas do arquivo (com a quebra, como readlines) sem carregá-lo inteiro.
+
+    Arquivos grandes são mapeados em memória; os demais são lidos linha a
+    linha do arquivo aberto. Em ambos os casos a memória não cresce com o
+    tamanho do arquivo.
+    """
+    tamanho = os.path.getsize(path)
+    if tamanho and tamanho >= mmap_min_bytes:
+        yield from _linhas_mmap(path, encoding)
+        return
+    with open(path, "r", encoding=encoding) as f:
+        yield from f
+
+
+def pular_cabecalho_rodape(linhas: Iterable[str], inicio: int = 2, fim: int = 2) -> Iterator[str]:
+    """Equivale a list(linhas)[inicio:-fim], mas guardando só `fim` linhas à frente."""
+    it = iter(linhas)
+    for _ in range(inicio):
+        if next(it, None) is None:
+            return
+    pendentes: deque = deque()
+    for linha in it:
+        pendentes.append(linha)
+        if len(pendentes) > fim:
+            yield pendentes.popleft()